@@ -1,15 +0,0 @@
-"""
-Memory management components.
-"""
-
-from .short_term import ShortTermMemory
-from .long_term import LongTermMemory
-from .learning import LearningSystem
-from .retrieval import RetrievalSystem
-
-__all__ = [
-    'ShortTermMemory',
-    'LongTermMemory',
-    'LearningSystem',
-    'RetrievalSystem'
-]
\ No newline at end of file
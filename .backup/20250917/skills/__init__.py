@@ -1,4 +0,0 @@
-"""
-Skills system for extending bot capabilities.
-"""
-# Pode ser deixado vazio ou conter imports de skills padrão
\ No newline at end of file
@@ -1,43 +0,0 @@
-from typing import Dict, Any
-from skills.base_skill import BaseSkill
-from utils.logger import get_logger
-
-logger = get_logger(__name__)
-
-class ImageGeneratorSkill(BaseSkill):
-    def __init__(self, config: Dict[str, Any]):
-        super().__init__(config)
-        self.provider = self._get_config_value("provider", "dall-e")
-        self.enabled = self._get_config_value("enabled", False)
-    
-    async def can_handle(self, intent: str, context: Dict[str, Any]) -> bool:
-        return intent.lower() in ["generate_image", "create_image", "image_generation"]
-    
-    async def execute(self, parameters: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-        if not self.enabled:
-            return {
-                "error": "Image generation is not enabled",
-                "suggestion": "Enable image generation in the bot configuration"
-            }
-        
-        try:
-            prompt = parameters.get("prompt", "")
-            size = parameters.get("size", "1024x1024")
-            
-            if not prompt:
-                return {"error": "Prompt parameter is required"}
-            
-            # Stub implementation - in a real implementation, this would call an image generation API
-            logger.debug(f"Would generate image with prompt: {prompt}", provider=self.provider)
-            
-            return {
-                "success": True,
-                "prompt": prompt,
-                "size": size,
-                "provider": self.provider,
-                "image_url": f"https://example.com/generated/{hash(prompt)}.png"  # Mock URL
-            }
-            
-        except Exception as e:
-            logger.error(f"Image generation error: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import yaml
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
@@ -168,5 +169,7 @@ class Settings(BaseModel):
             )
         )
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    # Lido uma única vez por processo (YAML + env); get_settings.cache_clear() força recarga
     return Settings.from_yaml()
\ No newline at end of file
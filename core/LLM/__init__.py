@@ -13,13 +13,14 @@ AVAILABLE_PROVIDERS = {
     "claude": ClaudeProvider,
 }
 
-def create_provider(provider_type: str, config: dict) -> LLMProvider:
+def create_provider(provider_type: str, config: dict, http_client=None) -> LLMProvider:
     """
     Factory function to create LLM providers
     
     Args:
         provider_type: Type of provider ('azure_openai', 'claude')
         config: Configuration dictionary for the provider
+        http_client: httpx.AsyncClient compartilhado (usado só por providers que suportam)
         
     Returns:
         Instance of the requested provider
@@ -31,6 +32,8 @@ def create_provider(provider_type: str, config: dict) -> LLMProvider:
         raise ValueError(f"Unknown provider type: {provider_type}")
     
     provider_class = AVAILABLE_PROVIDERS[provider_type]
+    if http_client is not None and provider_class.supports_http_client:
+        return provider_class(config, http_client=http_client)
     return provider_class(config)
 
 __all__ = [
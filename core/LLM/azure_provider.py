@@ -3,7 +3,9 @@ Azure OpenAI Provider Implementation - VERSÃO CORRIGIDA
 Com fallback robusto para variáveis de ambiente
 """
 import os
+import logging
 from typing import Dict, Any, List, Optional
+import httpx
 from openai import AsyncAzureOpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 from dotenv import load_dotenv
@@ -19,8 +21,12 @@ logger = get_logger(__name__)
 class AzureOpenAIProvider(LLMProvider):
     """Azure OpenAI implementation of LLM Provider"""
     
-    def __init__(self, config: Dict[str, Any]):
+    supports_http_client = True
+    
+    def __init__(self, config: Dict[str, Any], http_client: Optional[httpx.AsyncClient] = None):
         self.config = config
+        # Pool HTTP compartilhado da aplicação (None = cliente próprio do SDK)
+        self.http_client = http_client
         self.client = None
         self._initialize_client()
     
@@ -115,7 +121,8 @@ class AzureOpenAIProvider(LLMProvider):
                 azure_deployment=deployment_name,
                 # Desabilitar variáveis de ambiente padrão para evitar conflitos
                 azure_ad_token=None,
-                azure_ad_token_provider=None
+                azure_ad_token_provider=None,
+                http_client=self.http_client
             )
             
             # Guardar configurações para uso posterior
@@ -137,8 +144,10 @@ class AzureOpenAIProvider(LLMProvider):
         """Generate response using Azure OpenAI"""
         try:
             logger.info(f"🔷 Azure OpenAI: Generating response...")
-            logger.debug(f"   Using deployment: {self.deployment_name}")
-            logger.debug(f"   Prompt length: {len(prompt)} chars")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(f"   Using deployment: {self.deployment_name}")
+                logger.debug(f"   Prompt length: {len(prompt)} chars")
             
             # Criar mensagens
             messages = [
@@ -147,7 +156,7 @@ class AzureOpenAIProvider(LLMProvider):
             ]
             
             # Adicionar contexto se disponível
-            if context.get("conversation_history"):
+            if debug and context.get("conversation_history"):
                 logger.debug(f"   Including {len(context['conversation_history'])} history items")
             
             # Fazer chamada para API
@@ -181,7 +190,8 @@ class AzureOpenAIProvider(LLMProvider):
                     "completion_tokens": response.usage.completion_tokens,
                     "total_tokens": response.usage.total_tokens
                 }
-                logger.debug(f"   Tokens used: {response.usage.total_tokens}")
+                if debug:
+                    logger.debug(f"   Tokens used: {response.usage.total_tokens}")
             
             return result
             
@@ -231,4 +241,15 @@ class AzureOpenAIProvider(LLMProvider):
     
     def is_available(self) -> bool:
         """Check if Azure OpenAI is available"""
-        return self.client is not None
\ No newline at end of file
+        return self.client is not None
+    
+    async def warmup(self) -> None:
+        """Abre a conexão do pool com uma chamada barata (lista de modelos), sem retries"""
+        if self.client is None:
+            return
+        try:
+            await self.client.with_options(max_retries=0, timeout=5.0).models.list()
+            logger.debug("Azure OpenAI connection warmed up")
+        except Exception as e:
+            # Qualquer resposta (mesmo erro HTTP) já deixa a conexão aberta no pool
+            logger.debug(f"Azure OpenAI warm-up: {str(e)[:100]}")
\ No newline at end of file
@@ -7,6 +7,9 @@ from typing import Dict, Any, List
 class LLMProvider(ABC):
     """Base interface that all LLM providers must implement"""
     
+    # Providers com SDK assíncrono aceitam um httpx.AsyncClient compartilhado
+    supports_http_client = False
+    
     @abstractmethod
     async def generate(self, prompt: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -37,4 +40,11 @@ class LLMProvider(ABC):
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available and configured"""
+        pass
+    
+    async def warmup(self) -> None:
+        """
+        Open the provider connection ahead of the first request
+        (TCP + TLS handshake). Default: no-op
+        """
         pass
\ No newline at end of file
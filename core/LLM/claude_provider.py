@@ -4,6 +4,7 @@ Com timeout e retry otimizados
 """
 import os
 import asyncio
+import logging
 from typing import Dict, Any, List, Optional
 import anthropic
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -139,9 +140,11 @@ class ClaudeProvider(LLMProvider):
         """Generate response using Claude com timeout otimizado"""
         try:
             logger.info(f"🟣 Claude: Generating response...")
-            logger.debug(f"   Model: {self.model}")
-            logger.debug(f"   Prompt length: {len(prompt)} chars")
-            logger.debug(f"   Context keys: {list(context.keys())}")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(f"   Model: {self.model}")
+                logger.debug(f"   Prompt length: {len(prompt)} chars")
+                logger.debug(f"   Context keys: {list(context.keys())}")
             
             # Claude SDK não tem async ainda, usar run_in_executor
             loop = asyncio.get_event_loop()
@@ -217,7 +220,8 @@ class ClaudeProvider(LLMProvider):
                         getattr(message.usage, 'output_tokens', 0)
                     )
                 }
-                logger.debug(f"   Tokens used: {usage.get('total_tokens', 0)}")
+                if debug:
+                    logger.debug(f"   Tokens used: {usage.get('total_tokens', 0)}")
             
             # Incluir modelo usado na resposta
             return {
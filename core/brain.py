@@ -6,6 +6,8 @@ from typing import Dict, Any, Optional, List
 import time
 import os
 
+import httpx
+
 from config.settings import Settings
 from core.llm import create_provider, LLMProvider
 from memory.memory_manager import MemoryManager
@@ -33,13 +35,15 @@ class BotBrain:
         memory_manager: MemoryManager,
         learning_system: LearningSystem,
         retrieval_system: RetrievalSystem,
-        skill_registry: SkillRegistry
+        skill_registry: SkillRegistry,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         self.settings = settings
         self.memory_manager = memory_manager
         self.learning_system = learning_system
         self.retrieval_system = retrieval_system
         self.skill_registry = skill_registry
+        self.http_client = http_client
         
         # Learning Engine opcional
         self.learning_engine = None
@@ -68,7 +72,8 @@ class BotBrain:
             try:
                 self.primary_provider = create_provider(
                     primary_config['type'],
-                    primary_config
+                    primary_config,
+                    http_client=self.http_client
                 )
                 logger.info(f"✅ Primary provider ({primary_config['type']}) initialized")
             except Exception as e:
@@ -80,7 +85,8 @@ class BotBrain:
             try:
                 self.fallback_provider = create_provider(
                     fallback_config['type'],
-                    fallback_config
+                    fallback_config,
+                    http_client=self.http_client
                 )
                 logger.info(f"✅ Fallback provider ({fallback_config['type']}) initialized")
             except Exception as e:
@@ -1,3 +1,4 @@
+import logging
 from typing import Dict, Any, List, Optional
 from config.settings import Settings
 from memory.learning import LearningSystem
@@ -58,7 +59,8 @@ class ContextEngine:
         try:
             retrieval_context = await self.retrieval_system.retrieve_relevant_documents(message)
             context.update({"retrieved_documents": retrieval_context})
-            logger.debug(f"✅ Retrieved {len(retrieval_context)} documents")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ Retrieved {len(retrieval_context)} documents")
         except Exception as e:
             logger.debug(f"Retrieval context not available: {str(e)}")
         
@@ -68,5 +70,6 @@ class ContextEngine:
             "user_id": user_id
         })
         
-        logger.debug(f"Built context for user {user_id}", context_keys=list(context.keys()))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Built context for user {user_id}", context_keys=list(context.keys()))
         return context
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Configuração do gunicorn (workers uvicorn)
+Uso: gunicorn -c gunicorn_conf.py main:app
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Um worker por padrão: memória HOT (RAM), caches de learning/perfis e métricas Prometheus
+# são por processo, e nada aqui compartilha esse estado entre workers.
+# WEB_CONCURRENCY > 1 é opt-in (mensagens do mesmo usuário podem cair em workers diferentes)
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Preload desligado por padrão: cada worker importa o app no próprio processo.
+# GUNICORN_PRELOAD=1 importa main.py e os módulos pesados (SDKs de LLM, componentes) uma vez
+# no master e os workers herdam via fork (copy-on-write).
+# O lifespan continua rodando em cada worker depois do fork, então clientes (LLM, Cosmos,
+# httpx) e sockets nunca são compartilhados entre processos.
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+# Módulos importados no master antes do fork (só import: nada aqui abre conexões)
+PRELOAD_MODULES = (
+    "core.brain",
+    "core.context_engine",
+    "core.response_builder",
+    "core.router",
+    "memory.memory_manager",
+    "memory.learning",
+    "memory.retrieval",
+    "personality.personality_loader",
+    "skills.skill_registry",
+)
+
+def on_starting(server):
+    """Pré-importa os componentes pesados no master (só com preload_app)"""
+    if not preload_app:
+        return
+    
+    import importlib
+    
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            # Sem preload desse módulo: o worker importa no startup, como antes
+            server.log.warning(f"Preload of {module_name} failed: {e}")
+
+# Chamadas de LLM podem demorar; não matar o worker no meio da resposta
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = None
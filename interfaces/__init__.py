@@ -2,13 +2,25 @@
 Interface handlers for different communication channels.
 Includes base interface, Teams bot, and email handler.
 """
+import importlib
 
-from .base_interface import BaseInterface
-from .teams_bot import TeamsBotInterface
-from .email_handler import EmailHandlerInterface
+# Exports resolvidos sob demanda: importar interfaces.bot_framework_handler
+# não carrega Teams bot/email handler (nem core.brain via eles)
+_LAZY_EXPORTS = {
+    'BaseInterface': '.base_interface',
+    'TeamsBotInterface': '.teams_bot',
+    'EmailHandlerInterface': '.email_handler',
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'BaseInterface',
     'TeamsBotInterface',
     'EmailHandlerInterface'
-]
\ No newline at end of file
+]
@@ -2,11 +2,13 @@
 Bot Framework Handler para integração com Azure Bot Service e Teams
 """
 import json
+import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, Request, Response, HTTPException
 from fastapi.responses import JSONResponse
 import httpx
+import orjson
 
 from config.settings import Settings
 from core.brain import BotBrain
@@ -15,9 +17,13 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 class BotFrameworkHandler:
-    def __init__(self, settings: Settings, brain: BotBrain):
+    def __init__(self, settings: Settings, brain: BotBrain, http_client: Optional[httpx.AsyncClient] = None):
         self.settings = settings
         self.brain = brain
+        # Cliente HTTP compartilhado (pool de conexões/TLS reaproveitado entre replies)
+        # Só o cliente criado aqui é fechado em close(); o injetado pertence a quem o passou
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=30.0)
         self.router = APIRouter()
         self._setup_routes()
         
@@ -46,48 +52,54 @@ class BotFrameworkHandler:
         else:
             logger.warning("No App ID found in environment variables!")
     
+    async def close(self) -> None:
+        """Fecha o cliente HTTP se ele foi criado pelo próprio handler"""
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
     def _setup_routes(self):
         """Configura as rotas do Bot Framework"""
         
-        @self.router.post("/api/messages")
-        async def messages_handler(request: Request) -> Response:
-            """
-            Endpoint principal do Bot Framework
-            Recebe activities do Azure Bot Service
-            """
-            try:
-                # Lê o body da requisição
-                body = await request.body()
-                body_str = body.decode('utf-8')
-                
-                # Parse do JSON
-                try:
-                    activity = json.loads(body_str)
-                except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON received: {body_str[:200]}")
-                    return Response(status_code=400, content="Invalid JSON")
-                
-                logger.info(f"Received activity type: {activity.get('type')}")
-                logger.debug(f"Activity: {json.dumps(activity, indent=2)}")
-                
-                # Processa a activity
-                response = await self._process_activity(activity)
-                
-                # Bot Framework espera status 200 para sucesso
-                if response:
-                    return JSONResponse(content=response, status_code=200)
-                else:
-                    return Response(status_code=200)
-                    
-            except Exception as e:
-                logger.error(f"Error in messages_handler: {str(e)}")
-                return Response(status_code=500)
+        self.router.add_api_route("/api/messages", self.handle_messages, methods=["POST"])
         
         @self.router.options("/api/messages")
         async def messages_options() -> Response:
             """Handle OPTIONS requests for CORS"""
             return Response(status_code=200)
     
+    async def handle_messages(self, request: Request) -> Response:
+        """
+        Endpoint principal do Bot Framework
+        Recebe activities do Azure Bot Service
+        """
+        try:
+            # Lê o body da requisição
+            body = await request.body()
+            
+            # Parse do JSON direto dos bytes (orjson, sem decode intermediário)
+            try:
+                activity = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                logger.error(f"Invalid JSON received: {body[:200].decode('utf-8', 'replace')}")
+                return Response(status_code=400, content="Invalid JSON")
+            
+            logger.info(f"Received activity type: {activity.get('type')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Activity: {json.dumps(activity, indent=2)}")
+            
+            # Processa a activity
+            response = await self._process_activity(activity)
+            
+            # Bot Framework espera status 200 para sucesso
+            if response:
+                return JSONResponse(content=response, status_code=200)
+            else:
+                return Response(status_code=200)
+                
+        except Exception as e:
+            logger.error(f"Error in handle_messages: {str(e)}")
+            return Response(status_code=500)
+    
     async def _process_activity(self, activity: Dict[str, Any]) -> Dict[str, Any]:
         """
         Processa uma activity do Bot Framework
@@ -209,19 +221,18 @@ class BotFrameworkHandler:
         try:
             logger.info(f"Sending reply to: {reply_url}")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    reply_url,
-                    json=reply_activity,
-                    headers=headers,
-                    timeout=10.0
-                )
+            response = await self.http_client.post(
+                reply_url,
+                json=reply_activity,
+                headers=headers,
+                timeout=10.0
+            )
                 
-                if response.status_code in [200, 201, 202]:
-                    logger.info("✅ Reply sent successfully to Bot Framework")
-                else:
-                    logger.error(f"❌ Failed to send reply: {response.status_code}")
-                    logger.error(f"Response: {response.text}")
+            if response.status_code in [200, 201, 202]:
+                logger.info("✅ Reply sent successfully to Bot Framework")
+            else:
+                logger.error(f"❌ Failed to send reply: {response.status_code}")
+                logger.error(f"Response: {response.text}")
                     
         except Exception as e:
             logger.error(f"❌ Error sending reply: {str(e)}")
@@ -250,21 +261,20 @@ class BotFrameworkHandler:
                 "scope": "https://api.botframework.com/.default"
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    auth_url,
-                    data=data,  # Use data, not json
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
+            response = await self.http_client.post(
+                auth_url,
+                data=data,  # Use data, not json
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            )
                 
-                if response.status_code == 200:
-                    token_data = response.json()
-                    logger.info("Successfully obtained auth token")
-                    return token_data.get("access_token", "")
-                else:
-                    logger.error(f"Failed to get auth token: {response.status_code}")
-                    logger.error(f"Response: {response.text}")
-                    return ""
+            if response.status_code == 200:
+                token_data = response.json()
+                logger.info("Successfully obtained auth token")
+                return token_data.get("access_token", "")
+            else:
+                logger.error(f"Failed to get auth token: {response.status_code}")
+                logger.error(f"Response: {response.text}")
+                return ""
                     
         except Exception as e:
             logger.error(f"Error getting auth token: {str(e)}")
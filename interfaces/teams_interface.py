@@ -1,15 +1,34 @@
+import json
+import os
 from fastapi import APIRouter, Request, Response
-from fastapi.testclient import TestClient
 from interfaces.teams_bot import TeamsBotInterface
 
 # Router do FastAPI para integrar com o Teams
 router = APIRouter()
 
+_IS_PROD = os.getenv("ENV") == "production"
+
+# Activity fake do /test/teams, serializada uma única vez
+_FAKE_TEAMS_ACTIVITY_BODY = json.dumps({
+    "type": "message",
+    "text": "Olá bot",
+    "from": {"id": "user1"},
+    "recipient": {"id": "bot"},
+    "conversation": {"id": "conv1"},
+    "channelId": "msteams",
+    "id": "msg1",
+    "serviceUrl": "http://localhost"
+})
+
 @router.post("/api/messages")
 async def messages(req: Request) -> Response:
     body_bytes = await req.body()
     body = body_bytes.decode("utf-8")
     auth_header = req.headers.get("Authorization", "")
+    return await _process_body(req, body, auth_header)
+
+async def _process_body(req: Request, body: str, auth_header: str) -> Response:
+    """Entrega o body da activity ao adapter do Teams"""
     bot_interface: TeamsBotInterface = getattr(req.app.state, "teams_interface", None)
     if bot_interface is None:
         return Response(status_code=500, content="Teams interface not initialized")
@@ -21,29 +40,17 @@ async def messages(req: Request) -> Response:
         return Response(status_code=200)
 
 @router.post("/test/teams")
-async def test_teams_message():
+async def test_teams_message(req: Request):
     """
     Endpoint de teste local para simular uma mensagem recebida do Teams e processada pelo BotBrain.
     """
-    import os
-    if os.getenv("ENV") == "production":
+    if _IS_PROD:
         return {"status_code": 403, "response": "Disabled in production"}
-    from main import app
-    client = TestClient(app)
-    fake_activity = {
-        "type": "message",
-        "text": "Olá bot",
-        "from": {"id": "user1"},
-        "recipient": {"id": "bot"},
-        "conversation": {"id": "conv1"},
-        "channelId": "msteams",
-        "id": "msg1",
-        "serviceUrl": "http://localhost"
-    }
-    response = client.post("/api/messages", json=fake_activity)
+    # Chamada direta (sem reentrar no app via HTTP)
+    response = await _process_body(req, _FAKE_TEAMS_ACTIVITY_BODY, "")
     return {
         "status_code": response.status_code,
-        "response": response.text
+        "response": response.body.decode("utf-8")
     }
 
 # Exemplo de teste com curl:
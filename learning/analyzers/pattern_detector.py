@@ -2,15 +2,77 @@
 Pattern Detector - Identifica padrões em conversas
 Detecta sequências, repetições e comportamentos
 """
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Deque, Callable
 from datetime import datetime, timedelta
-from collections import Counter
+from collections import Counter, defaultdict, deque
+from itertools import islice
 import re
 
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Regex pré-compilada usada na normalização (evita lookup no cache do re)
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+def _period_for_hour(hour: int) -> str:
+    """Período do dia para uma hora (0-23)"""
+    if 5 <= hour < 12:
+        return "manhã"
+    elif 12 <= hour < 18:
+        return "tarde"
+    elif 18 <= hour < 22:
+        return "noite"
+    else:
+        return "madrugada"
+
+# Tabela pré-computada hora -> período
+_HOUR_PERIOD: Tuple[str, ...] = tuple(_period_for_hour(h) for h in range(24))
+
+def _build_similarity_filter(min_similarity: float) -> Callable[[frozenset, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Gera o filtro de mensagens similares especializado para o threshold
+    Threshold e helpers ficam como variáveis locais da closure, evitando
+    lookups de atributo dentro do loop
+    """
+    punctuation_sub = _PUNCTUATION_RE.sub
+    
+    def similarity_filter(current_words: frozenset,
+                          history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        similar_messages = []
+        
+        current_size = len(current_words)
+        if not current_size:
+            return similar_messages
+        
+        for item in history:
+            hist_message = item.get("message", "")
+            if not hist_message:
+                continue
+            
+            hist_words = frozenset(punctuation_sub(' ', hist_message.lower()).split())
+            
+            # Filtro por tamanho: Jaccard <= min(|A|,|B|) / max(|A|,|B|),
+            # então pares com tamanhos muito diferentes são descartados
+            # sem calcular a interseção
+            hist_size = len(hist_words)
+            if not hist_size or min(current_size, hist_size) / max(current_size, hist_size) < min_similarity:
+                continue
+            
+            intersection = len(current_words & hist_words)
+            similarity = intersection / (current_size + hist_size - intersection)
+            
+            if similarity >= min_similarity:
+                similar_messages.append({
+                    "message": hist_message,
+                    "timestamp": item.get("timestamp"),
+                    "similarity": similarity
+                })
+        
+        return similar_messages
+    
+    return similarity_filter
+
 class PatternType:
     """Tipos de padrões detectáveis"""
     RECURRING_QUESTION = "recurring_question"
@@ -27,108 +89,104 @@ class PatternDetector:
     """
     
     def __init__(self):
-        # Thresholds de detecção
+        # Thresholds de detecção (min_similarity reconstrói o filtro especializado)
         self.min_similarity = 0.7
         self.min_pattern_occurrences = 2
         self.time_window_hours = 168  # 1 semana
         
-        # Cache de padrões detectados
-        self.pattern_cache: Dict[str, List[Dict]] = {}
+        # Cache de padrões detectados (limitado aos últimos N por usuário)
+        self.max_cached_patterns = 100
+        self.pattern_cache: Dict[str, Deque[Dict]] = defaultdict(
+            lambda: deque(maxlen=self.max_cached_patterns)
+        )
         
         logger.info("📊 Pattern Detector initialized")
     
+    @property
+    def min_similarity(self) -> float:
+        return self._min_similarity
+    
+    @min_similarity.setter
+    def min_similarity(self, value: float) -> None:
+        self._min_similarity = value
+        self._fast_filter = _build_similarity_filter(value)
+    
     async def detect_patterns(self,
                              user_id: str,
                              current_message: str,
                              conversation_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Detecta todos os padrões relevantes na conversa
+        Os detectores são CPU-bound e rodam de forma síncrona
         """
         patterns = []
         
+        # Lowercase calculado uma única vez e compartilhado pelos detectores
+        message_lower = current_message.lower()
+        
         # 1. Detectar perguntas recorrentes
-        recurring = await self._detect_recurring_questions(
-            current_message, conversation_history
+        recurring = self._detect_recurring_questions(
+            message_lower, conversation_history
         )
         if recurring:
             patterns.extend(recurring)
         
         # 2. Detectar rotinas diárias
-        routine = await self._detect_daily_routines(
+        routine = self._detect_daily_routines(
             user_id, conversation_history
         )
         if routine:
             patterns.append(routine)
         
         # 3. Detectar sequências de tópicos
-        sequences = await self._detect_topic_sequences(
+        sequences = self._detect_topic_sequences(
             conversation_history
         )
         if sequences:
             patterns.extend(sequences)
         
         # 4. Detectar sinais de satisfação/insatisfação
-        satisfaction = await self._detect_satisfaction_patterns(
-            current_message
+        satisfaction = self._detect_satisfaction_patterns(
+            message_lower
         )
         if satisfaction:
             patterns.append(satisfaction)
         
         # 5. Detectar padrões de comando
-        commands = await self._detect_command_patterns(
-            current_message
+        commands = self._detect_command_patterns(
+            message_lower
         )
         if commands:
             patterns.extend(commands)
         
-        # Adicionar metadata
+        # Adicionar metadata (um único timestamp para toda a detecção)
+        detected_at = datetime.now().isoformat()
         for pattern in patterns:
-            pattern["detected_at"] = datetime.now().isoformat()
+            pattern["detected_at"] = detected_at
             pattern["user_id"] = user_id
         
-        # Atualizar cache
-        if user_id not in self.pattern_cache:
-            self.pattern_cache[user_id] = []
+        # Atualizar cache (deque descarta automaticamente os mais antigos)
         self.pattern_cache[user_id].extend(patterns)
         
-        # Limitar cache
-        if len(self.pattern_cache[user_id]) > 100:
-            self.pattern_cache[user_id] = self.pattern_cache[user_id][-100:]
-        
         logger.debug(f"Detected {len(patterns)} patterns for user {user_id}")
         
         return patterns
     
-    async def _detect_recurring_questions(self,
-                                         current_message: str,
-                                         history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _detect_recurring_questions(self,
+                                   message_lower: str,
+                                   history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Detecta perguntas que se repetem
+        Espera a mensagem atual já em lowercase
         """
         patterns = []
         
         if not history:
             return patterns
         
-        # Normalizar mensagem atual
-        current_normalized = self._normalize_message(current_message)
-        
-        # Contar mensagens similares
-        similar_messages = []
-        for item in history:
-            hist_message = item.get("message", "")
-            if hist_message:
-                similarity = self._calculate_similarity(
-                    current_normalized,
-                    self._normalize_message(hist_message)
-                )
-                
-                if similarity >= self.min_similarity:
-                    similar_messages.append({
-                        "message": hist_message,
-                        "timestamp": item.get("timestamp"),
-                        "similarity": similarity
-                    })
+        # Tokenizar mensagem atual uma única vez e filtrar o histórico
+        current_words = self._tokenize_lowered(message_lower)
+        similar_messages = self._fast_filter(current_words, history)
         
         # Se encontrou repetições
         if len(similar_messages) >= self.min_pattern_occurrences:
@@ -143,9 +201,9 @@ class PatternDetector:
         
         return patterns
     
-    async def _detect_daily_routines(self,
-                                    user_id: str,
-                                    history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _detect_daily_routines(self,
+                              user_id: str,
+                              history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         Detecta rotinas baseadas em horário
         """
@@ -184,8 +242,8 @@ class PatternDetector:
         
         return None
     
-    async def _detect_topic_sequences(self,
-                                     history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _detect_topic_sequences(self,
+                               history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Detecta sequências comuns de tópicos
         """
@@ -217,10 +275,11 @@ class PatternDetector:
         
         return patterns
     
-    async def _detect_satisfaction_patterns(self,
-                                           message: str) -> Optional[Dict[str, Any]]:
+    def _detect_satisfaction_patterns(self,
+                                     message_lower: str) -> Optional[Dict[str, Any]]:
         """
         Detecta sinais de satisfação ou insatisfação
+        Espera a mensagem já em lowercase
         """
         # Indicadores
         positive_indicators = [
@@ -234,8 +293,6 @@ class PatternDetector:
             "não ajudou", "confuso"
         ]
         
-        message_lower = message.lower()
-        
         # Contar indicadores
         positive_count = sum(1 for ind in positive_indicators if ind in message_lower)
         negative_count = sum(1 for ind in negative_indicators if ind in message_lower)
@@ -257,10 +314,11 @@ class PatternDetector:
         
         return None
     
-    async def _detect_command_patterns(self,
-                                      message: str) -> List[Dict[str, Any]]:
+    def _detect_command_patterns(self,
+                                message_lower: str) -> List[Dict[str, Any]]:
         """
         Detecta padrões de comando ou solicitação
+        Espera a mensagem já em lowercase
         """
         patterns = []
         
@@ -274,8 +332,6 @@ class PatternDetector:
             "comparison": r"(comparar?|diferença|versus|melhor|pior)"
         }
         
-        message_lower = message.lower()
-        
         for command_type, pattern in command_patterns.items():
             if re.search(pattern, message_lower):
                 patterns.append({
@@ -289,54 +345,21 @@ class PatternDetector:
         
         return patterns
     
-    def _normalize_message(self, message: str) -> str:
+    def _tokenize_lowered(self, message_lower: str) -> frozenset:
         """
-        Normaliza mensagem para comparação
+        Converte mensagem já em lowercase no conjunto de palavras sem pontuação
+        Mesma tokenização usada pelo filtro de similaridade (_build_similarity_filter)
         """
-        if not message:
-            return ""
-        
-        # Lowercase
-        normalized = message.lower()
-        
-        # Remover pontuação
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        
-        # Remover espaços extras
-        normalized = ' '.join(normalized.split())
-        
-        return normalized
-    
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """
-        Calcula similaridade entre dois textos (Jaccard)
-        """
-        if not text1 or not text2:
-            return 0.0
-        
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        if not message_lower:
+            return frozenset()
         
-        return len(intersection) / len(union) if union else 0.0
+        return frozenset(_PUNCTUATION_RE.sub(' ', message_lower).split())
     
     def _get_time_period(self, hour: int) -> str:
         """
         Retorna período do dia baseado na hora
         """
-        if 5 <= hour < 12:
-            return "manhã"
-        elif 12 <= hour < 18:
-            return "tarde"
-        elif 18 <= hour < 22:
-            return "noite"
-        else:
-            return "madrugada"
+        return _HOUR_PERIOD[hour]
     
     def _extract_topic(self, message: str) -> Optional[str]:
         """
@@ -406,5 +429,5 @@ class PatternDetector:
             "total_patterns": len(patterns),
             "pattern_types": dict(pattern_types),
             "last_detection": last_detection,
-            "top_patterns": patterns[-5:]  # Últimos 5 padrões
+            "top_patterns": list(islice(patterns, max(0, len(patterns) - 5), None))  # Últimos 5 padrões
         }
\ No newline at end of file
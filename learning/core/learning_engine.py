@@ -30,10 +30,17 @@ class LearningEngine:
         # Cache de perfis em memória
         self.profile_cache: Dict[str, UserProfile] = {}
         
+        # Perfis alterados aguardando persistência (write-coalescing)
+        self._dirty_profiles: Dict[str, UserProfile] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_failures = 0
+        
         # Configurações
         self.learning_enabled = settings.memory.learning.get("enabled", True)
         self.min_confidence = settings.memory.learning.get("min_confidence", 0.7)
         self.auto_learn = settings.memory.learning.get("auto_learn", True)
+        self.flush_interval = settings.memory.learning.get("flush_interval_seconds", 0.5)
+        self.flush_max_backoff = settings.memory.learning.get("flush_max_backoff_seconds", 60)
         
         logger.info("🧠 Learning Engine initialized")
         logger.info(f"   Learning: {'Enabled' if self.learning_enabled else 'Disabled'}")
@@ -132,19 +139,111 @@ class LearningEngine:
             # Atualizar perfil
             profile.update_from_interaction(message, response, metadata)
             
-            # Salvar perfil atualizado
-            await self.learning_store.save_profile(profile)
-            
             # Analisar satisfação implícita
             satisfaction = await self._analyze_implicit_satisfaction(message, response, metadata)
             if satisfaction is not None:
                 profile.add_feedback(satisfaction)
             
+            # Agendar persistência (várias interações viram um único save)
+            self._mark_dirty(profile)
+            
             logger.info(f"✅ Learned from interaction - User: {user_id}, Confidence: {profile.profile_confidence:.2f}")
             
         except Exception as e:
             logger.error(f"Error learning from interaction: {str(e)}")
     
+    def _mark_dirty(self, profile: UserProfile) -> None:
+        """
+        Marca perfil para persistência e garante que o flush está agendado
+        """
+        self._dirty_profiles[profile.user_id] = profile
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_delay(self.flush_interval))
+    
+    async def _flush_after_delay(self, delay: float) -> None:
+        """Aguarda a janela de coalescência (ou o backoff) e persiste os perfis pendentes"""
+        await asyncio.sleep(delay)
+        await self.flush_profiles()
+    
+    def _schedule_retry(self) -> float:
+        """
+        Reagenda o flush com backoff exponencial após falhas
+        Se já houver outro flush agendado, ele cobre a nova tentativa
+        """
+        self._flush_failures += 1
+        delay = min(self.flush_interval * 2 ** self._flush_failures, self.flush_max_backoff)
+        
+        task = self._flush_task
+        if task is None or task.done() or task is asyncio.current_task():
+            self._flush_task = asyncio.create_task(self._flush_after_delay(delay))
+        return delay
+    
+    async def flush_profiles(self, retry: bool = True) -> int:
+        """
+        Persiste todos os perfis pendentes em paralelo
+        Falhas continuam pendentes e, com retry=True, ganham um novo flush com backoff
+        Retorna número de perfis salvos
+        """
+        if not self._dirty_profiles:
+            return 0
+        
+        pending = self._dirty_profiles
+        self._dirty_profiles = {}
+        
+        profiles = list(pending.values())
+        try:
+            results = await asyncio.gather(
+                *(self.learning_store.save_profile(p) for p in profiles),
+                return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            # Flush interrompido (ex.: shutdown): os perfis voltam para pendentes
+            for profile in profiles:
+                self._dirty_profiles.setdefault(profile.user_id, profile)
+            raise
+        
+        saved = 0
+        for profile, result in zip(profiles, results):
+            if result is True:
+                saved += 1
+            else:
+                # Mantém pendente para a próxima janela, sem sobrescrever versão mais nova
+                self._dirty_profiles.setdefault(profile.user_id, profile)
+        
+        if saved:
+            logger.debug(f"Flushed {saved} profiles to learning store")
+        
+        failed = len(profiles) - saved
+        if not failed:
+            self._flush_failures = 0
+        elif retry:
+            delay = self._schedule_retry()
+            logger.warning(f"Failed to flush {failed} profiles, retrying in {delay:.1f}s")
+        else:
+            logger.warning(f"Failed to flush {failed} profiles")
+        
+        return saved
+    
+    async def close(self) -> int:
+        """
+        Flush final no shutdown: cancela o flush agendado e persiste o que estiver pendente
+        (perfis e padrões enfileirados no Learning Store)
+        Retorna número de perfis salvos
+        """
+        task = self._flush_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        
+        saved = await self.flush_profiles(retry=False)
+        await self.learning_store.close()
+        return saved
+    
     async def personalize_response(self,
                                   response: str,
                                   user_id: str,
@@ -316,6 +415,9 @@ class LearningEngine:
         """
         from datetime import timedelta
         
+        # Garantir que nada pendente seja perdido antes de remover do cache
+        await self.flush_profiles()
+        
         now = datetime.now()
         profiles_removed = 0
         
@@ -323,7 +425,7 @@ class LearningEngine:
             profile = self.profile_cache[user_id]
             age = now - profile.last_updated
             
-            if age > timedelta(hours=max_age_hours):
+            if age > timedelta(hours=max_age_hours) and user_id not in self._dirty_profiles:
                 del self.profile_cache[user_id]
                 profiles_removed += 1
         
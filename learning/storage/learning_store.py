@@ -2,16 +2,191 @@
 Learning Store - Armazenamento para Sistema de Aprendizagem
 Gerencia persistência de perfis, padrões e conhecimento
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable, Iterable, Iterator, Awaitable, AsyncIterator
+import asyncio
+import time
 from datetime import datetime, timedelta
-import json
+from collections import Counter, deque
+from itertools import groupby, islice
 import uuid
+import zlib
+import base64
+
+import orjson
+
+# SDK do Cosmos opcional: sem ele o LearningStore roda só em memória
+try:
+    from azure.cosmos import PartitionKey
+    from azure.core import MatchConditions
+    from azure.cosmos.exceptions import CosmosResourceNotFoundError, CosmosAccessConditionFailedError
+    COSMOS_SDK_AVAILABLE = True
+except ImportError:
+    COSMOS_SDK_AVAILABLE = False
 
 from config.settings import Settings
 from utils.logger import get_logger
+from utils.cache import TTLCache
 
 logger = get_logger(__name__)
 
+# Limite de operações por batch transacional do Cosmos
+PATTERN_BATCH_SIZE = 100
+
+# Padrões expiram em 30 dias (TTL do container e poda em memória)
+PATTERN_TTL_SECONDS = 2592000
+
+# Chaves de partição dos containers
+if COSMOS_SDK_AVAILABLE:
+    _PK_USER_ID = PartitionKey(path="/userId")
+    _PK_DOMAIN = PartitionKey(path="/domain")
+
+_profile_id = "profile_{}".format
+
+# Tentativas de read-modify-write otimista em update_knowledge_confidence
+_CONFIDENCE_RETRIES = 3
+
+# Campos do perfil que nunca são comprimidos (id, partição e controle)
+_PROFILE_PLAIN_FIELDS = frozenset({"id", "userId", "user_id", "type", "last_saved"})
+
+# Queries SQL (montadas uma única vez)
+_Q_PATTERNS_TOP = (
+    "SELECT TOP @limit * FROM c "
+    "WHERE c.userId = @userId AND c.type = 'pattern' "
+    "ORDER BY c.ts DESC"
+)
+
+# Itens antigos sem os campos *_lc ainda caem no LOWER()
+_KNOWLEDGE_MATCH = (
+    "((IS_DEFINED(c.content_lc) "
+    "AND (CONTAINS(c.content_lc, @query) OR CONTAINS(c.topic_lc, @query))) "
+    "OR (NOT IS_DEFINED(c.content_lc) "
+    "AND (CONTAINS(LOWER(c.content), @query) OR CONTAINS(LOWER(c.topic), @query))))"
+)
+_Q_KNOWLEDGE_SEARCH = "SELECT * FROM c WHERE c.type = 'knowledge' AND " + _KNOWLEDGE_MATCH
+_Q_KNOWLEDGE_SEARCH_DOMAIN = (
+    "SELECT * FROM c WHERE c.type = 'knowledge' AND c.domain = @domain AND " + _KNOWLEDGE_MATCH
+)
+_Q_KNOWLEDGE_BY_ID = "SELECT * FROM c WHERE c.id = @id"
+_Q_COUNT_BY_TYPE = "SELECT VALUE COUNT(1) FROM c WHERE c.type = @type"
+_Q_WARMUP = "SELECT TOP 1 c.id FROM c"
+
+
+# CosmosClient compartilhados por processo (chave: endpoint + key)
+_cosmos_clients: Dict[Tuple[str, str], Any] = {}
+
+
+def _get_cosmos_client(endpoint: str, key: str):
+    """
+    CosmosClient compartilhado por processo
+    Evita novo handshake TLS e nova leitura de metadados a cada LearningStore
+    """
+    client = _cosmos_clients.get((endpoint, key))
+    if client is None:
+        from azure.cosmos.aio import CosmosClient
+
+        client = _cosmos_clients[(endpoint, key)] = CosmosClient(endpoint, credential=key)
+    return client
+
+
+async def close_cosmos_clients() -> None:
+    """Fecha os CosmosClient compartilhados (sessão aiohttp) e esvazia o cache; usado no shutdown"""
+    clients = list(_cosmos_clients.values())
+    _cosmos_clients.clear()
+    
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Cosmos client: {str(e)}")
+
+
+def _pattern_user(pattern: Dict[str, Any]) -> str:
+    return pattern["userId"]
+
+
+def _pack_profile(doc: Dict[str, Any], threshold: int) -> Dict[str, Any]:
+    """
+    Comprime (zlib + base64) os campos do perfil quando passam de `threshold` bytes
+    Documentos pequenos seguem sem compressão
+    """
+    rest = {k: v for k, v in doc.items() if k not in _PROFILE_PLAIN_FIELDS}
+    payload = orjson.dumps(rest)
+    if len(payload) <= threshold:
+        return doc
+    
+    packed = {k: v for k, v in doc.items() if k in _PROFILE_PLAIN_FIELDS}
+    packed["payload_zlib"] = base64.b64encode(zlib.compress(payload)).decode("ascii")
+    return packed
+
+
+def _unpack_profile(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverte _pack_profile; documentos sem compressão voltam como estão"""
+    blob = doc.pop("payload_zlib", None)
+    if blob is not None:
+        doc.update(orjson.loads(zlib.decompress(base64.b64decode(blob))))
+    return doc
+
+
+def _chunk_by_user(items: Iterable[Any], key: Callable[[Any], str]) -> Iterator[Tuple[str, List[Any]]]:
+    """Agrupa itens por userId em blocos de até PATTERN_BATCH_SIZE"""
+    for user_id, group in groupby(sorted(items, key=key), key=key):
+        group = list(group)
+        for start in range(0, len(group), PATTERN_BATCH_SIZE):
+            yield user_id, group[start:start + PATTERN_BATCH_SIZE]
+
+
+class _TrigramIndex:
+    """
+    Índice de trigramas dos itens de conhecimento em memória de um domínio
+    Gera candidatos para a busca; a confirmação continua sendo `q in texto`
+    """
+    
+    def __init__(self):
+        self.grams: Dict[str, Set[int]] = {}
+        self.docs: Dict[int, Dict[str, Any]] = {}  # Em ordem de inserção
+        self._next_seq = 0
+    
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    def _item_trigrams(self, item: Dict[str, Any]) -> Set[str]:
+        return self._trigrams(item["content_lc"]) | self._trigrams(item["topic_lc"])
+    
+    def add(self, item: Dict[str, Any]) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        self.docs[seq] = item
+        for gram in self._item_trigrams(item):
+            self.grams.setdefault(gram, set()).add(seq)
+    
+    def remove_oldest(self) -> None:
+        seq = next(iter(self.docs))
+        item = self.docs.pop(seq)
+        for gram in self._item_trigrams(item):
+            posting = self.grams[gram]
+            posting.discard(seq)
+            if not posting:
+                del self.grams[gram]
+    
+    def search(self, q: str) -> List[Dict[str, Any]]:
+        """Itens cujo content_lc ou topic_lc contém q (já em minúsculas), em ordem de inserção"""
+        if len(q) < 3:
+            # Consulta curta demais para trigramas: varre o domínio
+            seqs = self.docs
+        else:
+            postings = sorted((self.grams.get(gram, set()) for gram in self._trigrams(q)), key=len)
+            if not postings[0]:
+                return []
+            seqs = sorted(postings[0].intersection(*postings[1:]))
+        
+        docs = self.docs
+        return [
+            docs[seq] for seq in seqs
+            if q in docs[seq]["content_lc"] or q in docs[seq]["topic_lc"]
+        ]
+
+
 class LearningStore:
     """
     Storage para dados de aprendizagem
@@ -26,77 +201,151 @@ class LearningStore:
         self.patterns_container = None
         self.knowledge_container = None
         self.available = False
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+        self._warmup_task: Optional[asyncio.Task] = None
+        
+        # Limita requisições simultâneas ao Cosmos (fan-out de gather/batches)
+        self._cosmos_slots = asyncio.Semaphore(
+            settings.memory.learning.get("max_concurrent_requests", 32)
+        )
+        
+        # Fila de padrões aguardando o próximo batch
+        self._pending_patterns: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._pattern_flush_task: Optional[asyncio.Task] = None
+        self.pattern_flush_interval = settings.memory.learning.get("pattern_flush_interval_seconds", 0.05)
+        
+        # Estatísticas: contadores locais e snapshot das contagens do Cosmos
+        self._write_counts: Counter = Counter()
+        self._stats_snapshot: Optional[Tuple[float, Dict[str, int]]] = None
+        self._stats_lock = asyncio.Lock()
+        self.stats_ttl = settings.memory.learning.get("stats_ttl_seconds", 60)
+        
+        # Caches de leitura (apenas para o Cosmos) e leituras em andamento por chave
+        self._profile_cache = TTLCache(
+            maxsize=10000, ttl=settings.memory.learning.get("profile_cache_ttl_seconds", 300)
+        )
+        self._search_cache = TTLCache(
+            maxsize=1000, ttl=settings.memory.learning.get("search_cache_ttl_seconds", 60)
+        )
+        self._profile_reads: Dict[str, asyncio.Task] = {}
+        
+        # Perfis acima deste tamanho (bytes) vão comprimidos para o Cosmos
+        self.profile_compress_threshold = settings.memory.learning.get(
+            "profile_compress_threshold_bytes", 4096
+        )
+        self._search_reads: Dict[Tuple[str, Optional[str]], asyncio.Task] = {}
         
         self._initialize_storage()
     
     def _initialize_storage(self):
-        """Inicializa conexão com Cosmos DB"""
-        try:
-            # Verificar se Cosmos está configurado
-            if not self.settings.cosmos.endpoint or not self.settings.cosmos.key:
-                logger.warning("Cosmos DB not configured for Learning Store")
-                logger.info("Using in-memory storage only")
-                self._init_memory_storage()
+        """Decide o backend; a conexão com o Cosmos é feita em initialize()"""
+        # Verificar se Cosmos está configurado
+        if not self.settings.cosmos.endpoint or not self.settings.cosmos.key:
+            logger.warning("Cosmos DB not configured for Learning Store")
+            logger.info("Using in-memory storage only")
+            self._init_memory_storage()
+            self._initialized = True
+        elif not COSMOS_SDK_AVAILABLE:
+            logger.warning("azure-cosmos not installed for Learning Store")
+            logger.info("Using in-memory storage only")
+            self._init_memory_storage()
+            self._initialized = True
+    
+    async def initialize(self):
+        """Inicializa conexão com Cosmos DB (executado uma única vez)"""
+        async with self._init_lock:
+            if self._initialized:
                 return
             
-            from azure.cosmos import CosmosClient, PartitionKey
-            
-            # Conectar ao Cosmos
-            self.client = CosmosClient(
-                self.settings.cosmos.endpoint,
-                credential=self.settings.cosmos.key
-            )
-            
-            # Database
-            db_name = self.settings.cosmos.database or "bot-memory"
-            self.database = self.client.get_database_client(db_name)
-            
-            # Container para perfis de usuário
-            try:
-                self.profiles_container = self.database.create_container_if_not_exists(
-                    id="user_profiles_enhanced",
-                    partition_key=PartitionKey(path="/userId"),
-                    default_ttl=None  # Perfis não expiram
-                )
-                logger.info("✅ User profiles container ready")
-            except Exception as e:
-                logger.error(f"Error creating profiles container: {str(e)}")
-            
-            # Container para padrões detectados
             try:
-                self.patterns_container = self.database.create_container_if_not_exists(
-                    id="learning_patterns",
-                    partition_key=PartitionKey(path="/userId"),
-                    default_ttl=2592000  # 30 dias
+                # Conectar ao Cosmos (cliente reaproveitado entre instâncias)
+                self.client = _get_cosmos_client(
+                    self.settings.cosmos.endpoint,
+                    self.settings.cosmos.key
                 )
-                logger.info("✅ Patterns container ready")
-            except Exception as e:
-                logger.error(f"Error creating patterns container: {str(e)}")
-            
-            # Container para base de conhecimento
-            try:
-                self.knowledge_container = self.database.create_container_if_not_exists(
-                    id="knowledge_base",
-                    partition_key=PartitionKey(path="/domain"),
-                    default_ttl=None  # Conhecimento não expira
+                
+                # Database
+                db_name = self.settings.cosmos.database or "bot-memory"
+                self.database = self.client.get_database_client(db_name)
+                
+                # Containers criados em paralelo
+                (
+                    self.profiles_container,
+                    self.patterns_container,
+                    self.knowledge_container
+                ) = await asyncio.gather(
+                    # Perfis de usuário (não expiram)
+                    self._create_container("user_profiles_enhanced", _PK_USER_ID, None, "User profiles"),
+                    # Padrões detectados (30 dias)
+                    self._create_container("learning_patterns", _PK_USER_ID, PATTERN_TTL_SECONDS, "Patterns"),
+                    # Base de conhecimento (não expira)
+                    self._create_container("knowledge_base", _PK_DOMAIN, None, "Knowledge base")
                 )
-                logger.info("✅ Knowledge base container ready")
+                
+                self.available = True
+                logger.info("✅ Learning Store initialized with Cosmos DB")
+                
+                # Abre as conexões em segundo plano antes da primeira requisição real
+                self._warmup_task = asyncio.create_task(self._warmup())
+                
             except Exception as e:
-                logger.error(f"Error creating knowledge container: {str(e)}")
-            
-            self.available = True
-            logger.info("✅ Learning Store initialized with Cosmos DB")
+                logger.error(f"Failed to initialize Cosmos DB: {str(e)}")
+                logger.info("Falling back to in-memory storage")
+                self._init_memory_storage()
             
+            self._initialized = True
+    
+    async def _create_container(self, container_id: str, partition_key: "PartitionKey",
+                                default_ttl: Optional[int], label: str):
+        """Cria (ou abre) um container; em caso de erro retorna None"""
+        try:
+            container = await self.database.create_container_if_not_exists(
+                id=container_id,
+                partition_key=partition_key,
+                default_ttl=default_ttl
+            )
+            logger.info(f"✅ {label} container ready")
+            return container
         except Exception as e:
-            logger.error(f"Failed to initialize Cosmos DB: {str(e)}")
-            logger.info("Falling back to in-memory storage")
-            self._init_memory_storage()
+            logger.error(f"Error creating {label.lower()} container: {str(e)}")
+            return None
+    
+    async def _warmup(self) -> None:
+        """Executa uma query mínima em cada container para aquecer conexões e caches do SDK"""
+        containers = [
+            c for c in (self.profiles_container, self.patterns_container, self.knowledge_container) if c
+        ]
+        results = await asyncio.gather(
+            *(self._warmup_container(c) for c in containers),
+            return_exceptions=True
+        )
+        
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"Learning Store warm-up incomplete: {str(failures[0])}")
+        else:
+            logger.debug(f"Learning Store warm-up done ({len(containers)} containers)")
+    
+    async def _warmup_container(self, container) -> None:
+        # Sem partition_key a query passa por todos os ranges de partição
+        async with self._cosmos_slots:
+            async for _ in container.query_items(query=_Q_WARMUP, max_item_count=1):
+                break
+    
+    async def _ensure_storage(self):
+        """Garante que initialize() já rodou antes de qualquer operação"""
+        if not self._initialized:
+            await self.initialize()
     
     def _init_memory_storage(self):
         """Inicializa storage em memória como fallback"""
         self.memory_profiles = {}
         self.memory_patterns = {}
         self.memory_knowledge = {}
+        self.memory_knowledge_index: Dict[str, _TrigramIndex] = {}
+        # Cada usuário/domínio guarda no máximo memory_max_items itens
+        self.memory_max_items = self.settings.memory.learning.get("memory_max_items", 10000)
         self.available = True
         logger.info("✅ Learning Store using in-memory storage")
     
@@ -105,21 +354,29 @@ class LearningStore:
         Salva perfil de usuário
         """
         try:
+            await self._ensure_storage()
+            
             profile_dict = profile.to_dict()
-            profile_dict["id"] = f"profile_{profile.user_id}"
+            profile_dict["id"] = _profile_id(profile.user_id)
             profile_dict["userId"] = profile.user_id  # Para partição
             profile_dict["type"] = "user_profile"
             profile_dict["last_saved"] = datetime.now().isoformat()
             
             if self.profiles_container:
-                # Salvar no Cosmos
-                self.profiles_container.upsert_item(profile_dict)
+                # Salvar no Cosmos e atualizar o cache local
+                async with self._cosmos_slots:
+                    await self.profiles_container.upsert_item(
+                        _pack_profile(profile_dict, self.profile_compress_threshold)
+                    )
+                self._profile_reads.pop(profile.user_id, None)
+                self._profile_cache.set(profile.user_id, orjson.dumps(profile_dict))
                 logger.debug(f"Profile saved to Cosmos for user {profile.user_id}")
             else:
                 # Salvar em memória
                 self.memory_profiles[profile.user_id] = profile_dict
                 logger.debug(f"Profile saved to memory for user {profile.user_id}")
             
+            self._write_counts["profiles"] += 1
             return True
             
         except Exception as e:
@@ -131,18 +388,16 @@ class LearningStore:
         Recupera perfil de usuário
         """
         try:
+            await self._ensure_storage()
+            
             if self.profiles_container:
-                # Buscar no Cosmos
-                query = "SELECT * FROM c WHERE c.userId = @userId AND c.type = 'user_profile'"
-                items = list(self.profiles_container.query_items(
-                    query=query,
-                    parameters=[{"name": "@userId", "value": user_id}],
-                    partition_key=user_id
-                ))
-                
-                if items:
-                    logger.debug(f"Profile found in Cosmos for user {user_id}")
-                    return items[0]
+                # Cache local antes da leitura pontual no Cosmos
+                # O cache guarda o perfil serializado: cada chamador recebe uma cópia própria
+                snapshot = await self._cached_read(
+                    self._profile_cache, self._profile_reads, user_id,
+                    lambda: self._read_profile(user_id)
+                )
+                return orjson.loads(snapshot) if snapshot is not None else None
             else:
                 # Buscar em memória
                 if user_id in self.memory_profiles:
@@ -155,25 +410,73 @@ class LearningStore:
             logger.error(f"Error getting profile: {str(e)}")
             return None
     
+    async def _read_profile(self, user_id: str) -> Optional[bytes]:
+        """Leitura pontual do perfil no Cosmos (id determinístico), já serializada para o cache"""
+        try:
+            async with self._cosmos_slots:
+                item = await self.profiles_container.read_item(
+                    item=_profile_id(user_id),
+                    partition_key=user_id
+                )
+            logger.debug(f"Profile found in Cosmos for user {user_id}")
+            return orjson.dumps(_unpack_profile(item))
+        except CosmosResourceNotFoundError:
+            return None
+    
+    async def _cached_read(self, cache: TTLCache, inflight: Dict[Any, asyncio.Task],
+                           key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Leitura com cache TTL e uma única chamada em voo por chave
+        O resultado só entra no cache se nenhuma escrita invalidou a chave no meio tempo
+        """
+        value = cache.get(key)
+        if value is not None:
+            return value
+        
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            inflight[key] = task
+            
+            def _store(done: asyncio.Task) -> None:
+                if inflight.get(key) is not done:
+                    return
+                del inflight[key]
+                if not done.cancelled() and done.exception() is None and done.result() is not None:
+                    cache.set(key, done.result())
+            
+            task.add_done_callback(_store)
+        
+        return await asyncio.shield(task)
+    
+    def _invalidate_search_cache(self) -> None:
+        """Descarta buscas em cache após qualquer escrita na base de conhecimento"""
+        self._search_cache.clear()
+        self._search_reads.clear()
+    
     async def save_pattern(self, pattern: Dict[str, Any]) -> bool:
         """
         Salva padrão detectado
+        No Cosmos a escrita é agrupada com outras da mesma janela (ver flush_patterns)
         """
         try:
-            pattern["id"] = str(uuid.uuid4())
-            pattern["type"] = "pattern"
-            pattern["timestamp"] = datetime.now().isoformat()
+            await self._ensure_storage()
+            
+            self._prepare_pattern(pattern)
             
             if self.patterns_container:
-                # Salvar no Cosmos
-                self.patterns_container.create_item(pattern)
-                logger.debug(f"Pattern saved to Cosmos: {pattern.get('pattern_type')}")
+                # Enfileirar para o próximo batch no Cosmos
+                future = asyncio.get_running_loop().create_future()
+                self._pending_patterns.append((pattern, future))
+                
+                if self._pattern_flush_task is None or self._pattern_flush_task.done():
+                    self._pattern_flush_task = asyncio.create_task(self._flush_patterns_after_delay())
+                
+                return await future
             else:
                 # Salvar em memória
-                user_id = pattern.get("userId", "unknown")
-                if user_id not in self.memory_patterns:
-                    self.memory_patterns[user_id] = []
-                self.memory_patterns[user_id].append(pattern)
+                self._store_pattern_in_memory(pattern)
+                self._write_counts["patterns"] += 1
                 logger.debug(f"Pattern saved to memory: {pattern.get('pattern_type')}")
             
             return True
@@ -182,31 +485,133 @@ class LearningStore:
             logger.error(f"Error saving pattern: {str(e)}")
             return False
     
+    async def flush_patterns(self) -> int:
+        """
+        Grava no Cosmos os padrões enfileirados por save_pattern
+        Retorna quantos padrões foram salvos
+        """
+        if not self._pending_patterns:
+            return 0
+        
+        pending = self._pending_patterns
+        self._pending_patterns = []
+        
+        saved = 0
+        try:
+            chunks = list(_chunk_by_user(pending, lambda item: _pattern_user(item[0])))
+            results = await asyncio.gather(
+                *(self._execute_pattern_batch(user_id, [pattern for pattern, _ in chunk])
+                  for user_id, chunk in chunks)
+            )
+            
+            for (_, chunk), ok in zip(chunks, results):
+                if ok:
+                    saved += len(chunk)
+                for _, future in chunk:
+                    if not future.done():
+                        future.set_result(ok)
+        finally:
+            # Flush cancelado ou com erro: nenhum save_pattern fica esperando para sempre
+            for _, future in pending:
+                if not future.done():
+                    future.set_result(False)
+        
+        if saved:
+            logger.debug(f"Flushed {saved} patterns to Cosmos")
+        
+        return saved
+    
+    async def _flush_patterns_after_delay(self) -> None:
+        """Aguarda a janela de coalescência e grava os padrões pendentes"""
+        await asyncio.sleep(self.pattern_flush_interval)
+        try:
+            await self.flush_patterns()
+        except Exception as e:
+            logger.error(f"Error flushing patterns: {str(e)}")
+    
+    async def close(self) -> int:
+        """
+        Shutdown: cancela o flush agendado e grava os padrões ainda enfileirados
+        Retorna quantos padrões foram salvos
+        """
+        for task in (self._pattern_flush_task, self._warmup_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._pattern_flush_task = None
+        
+        return await self.flush_patterns()
+    
+    async def _execute_pattern_batch(self, user_id: str, patterns: List[Dict[str, Any]]) -> bool:
+        """Executa um batch transacional de criação na partição do usuário"""
+        try:
+            async with self._cosmos_slots:
+                await self.patterns_container.execute_item_batch(
+                    batch_operations=[("create", (pattern,)) for pattern in patterns],
+                    partition_key=user_id
+                )
+            self._write_counts["patterns"] += len(patterns)
+            logger.debug(f"Pattern batch saved to Cosmos: {len(patterns)} items for user {user_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving pattern batch: {str(e)}")
+            return False
+    
+    def _prepare_pattern(self, pattern: Dict[str, Any]) -> None:
+        """Preenche os campos de controle do documento de padrão"""
+        pattern["id"] = uuid.uuid4().hex
+        pattern["type"] = "pattern"
+        pattern["timestamp"] = datetime.now().isoformat()
+        pattern["ts"] = int(time.time() * 1000)  # Epoch em ms para ordenação
+        pattern.setdefault("userId", "unknown")  # Chave de partição
+    
+    def _store_pattern_in_memory(self, pattern: Dict[str, Any]) -> None:
+        """Adiciona padrão ao storage em memória"""
+        user_id = pattern["userId"]
+        if user_id not in self.memory_patterns:
+            self.memory_patterns[user_id] = deque(maxlen=self.memory_max_items)
+        patterns = self.memory_patterns[user_id]
+        patterns.append(pattern)
+        
+        # Ordem de inserção = ordem de ts: os expirados estão sempre à esquerda
+        expired_before = pattern["ts"] - PATTERN_TTL_SECONDS * 1000
+        while patterns[0]["ts"] < expired_before:
+            patterns.popleft()
+    
     async def get_patterns(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Recupera padrões do usuário
         """
         try:
+            await self._ensure_storage()
+            
             if self.patterns_container:
-                # Buscar no Cosmos
-                query = """
-                    SELECT TOP @limit * FROM c 
-                    WHERE c.userId = @userId AND c.type = 'pattern'
-                    ORDER BY c.timestamp DESC
-                """
-                items = list(self.patterns_container.query_items(
-                    query=query,
-                    parameters=[
-                        {"name": "@userId", "value": user_id},
-                        {"name": "@limit", "value": limit}
-                    ],
-                    partition_key=user_id
-                ))
+                # Buscar no Cosmos: uma página de até `limit` itens, sem drenar o pager
+                items = []
+                if limit <= 0:
+                    return items
+                
+                async with self._cosmos_slots:
+                    async for item in self.patterns_container.query_items(
+                        query=_Q_PATTERNS_TOP,
+                        parameters=[
+                            {"name": "@userId", "value": user_id},
+                            {"name": "@limit", "value": limit}
+                        ],
+                        partition_key=user_id,
+                        max_item_count=limit
+                    ):
+                        items.append(item)
+                        if len(items) >= limit:
+                            break
                 return items
             else:
-                # Buscar em memória
-                patterns = self.memory_patterns.get(user_id, [])
-                return sorted(patterns, key=lambda x: x.get("timestamp", ""), reverse=True)[:limit]
+                # Buscar em memória: o deque já está em ordem de inserção (ts)
+                patterns = self.memory_patterns.get(user_id, ())
+                return list(islice(reversed(patterns), max(limit, 0)))
             
         except Exception as e:
             logger.error(f"Error getting patterns: {str(e)}")
@@ -217,23 +622,39 @@ class LearningStore:
         Salva item na base de conhecimento
         """
         try:
-            knowledge_item["id"] = str(uuid.uuid4())
+            await self._ensure_storage()
+            
+            knowledge_item["id"] = uuid.uuid4().hex
             knowledge_item["type"] = "knowledge"
             knowledge_item["created_at"] = datetime.now().isoformat()
             knowledge_item["domain"] = knowledge_item.get("domain", "general")
+            knowledge_item.setdefault("confidence", 0.5)
+            # Campos já em minúsculas para a busca não aplicar LOWER() por documento
+            knowledge_item["content_lc"] = str(knowledge_item.get("content", "")).lower()
+            knowledge_item["topic_lc"] = str(knowledge_item.get("topic", "")).lower()
             
             if self.knowledge_container:
                 # Salvar no Cosmos
-                self.knowledge_container.create_item(knowledge_item)
+                async with self._cosmos_slots:
+                    await self.knowledge_container.create_item(knowledge_item)
+                self._invalidate_search_cache()
                 logger.debug(f"Knowledge saved to Cosmos: {knowledge_item.get('topic')}")
             else:
                 # Salvar em memória
                 domain = knowledge_item["domain"]
                 if domain not in self.memory_knowledge:
-                    self.memory_knowledge[domain] = []
-                self.memory_knowledge[domain].append(knowledge_item)
+                    self.memory_knowledge[domain] = deque(maxlen=self.memory_max_items)
+                    self.memory_knowledge_index[domain] = _TrigramIndex()
+                items = self.memory_knowledge[domain]
+                index = self.memory_knowledge_index[domain]
+                if len(items) == items.maxlen:
+                    # O append vai descartar o item mais antigo do deque
+                    index.remove_oldest()
+                items.append(knowledge_item)
+                index.add(knowledge_item)
                 logger.debug(f"Knowledge saved to memory: {knowledge_item.get('topic')}")
             
+            self._write_counts["knowledge"] += 1
             return True
             
         except Exception as e:
@@ -245,47 +666,27 @@ class LearningStore:
         Busca na base de conhecimento
         """
         try:
+            await self._ensure_storage()
+            
             if self.knowledge_container:
-                # Buscar no Cosmos
-                if domain:
-                    cosmos_query = """
-                        SELECT * FROM c 
-                        WHERE c.type = 'knowledge' 
-                        AND c.domain = @domain
-                        AND (CONTAINS(LOWER(c.content), LOWER(@query))
-                             OR CONTAINS(LOWER(c.topic), LOWER(@query)))
-                    """
-                    params = [
-                        {"name": "@domain", "value": domain},
-                        {"name": "@query", "value": query}
-                    ]
-                else:
-                    cosmos_query = """
-                        SELECT * FROM c 
-                        WHERE c.type = 'knowledge'
-                        AND (CONTAINS(LOWER(c.content), LOWER(@query))
-                             OR CONTAINS(LOWER(c.topic), LOWER(@query)))
-                    """
-                    params = [{"name": "@query", "value": query}]
-                
-                items = list(self.knowledge_container.query_items(
-                    query=cosmos_query,
-                    parameters=params,
-                    enable_cross_partition_query=True
-                ))
-                return items
+                # Cache local antes da query no Cosmos
+                # Como no cache de perfis, guarda o resultado serializado: cada chamador recebe cópias próprias
+                snapshot = await self._cached_read(
+                    self._search_cache, self._search_reads, (query.lower(), domain),
+                    lambda: self._query_knowledge(query, domain)
+                )
+                return orjson.loads(snapshot)
             else:
                 # Buscar em memória
                 results = []
                 search_domains = [domain] if domain else self.memory_knowledge.keys()
+                q = query.lower()
                 
+                # O índice de trigramas reduz os candidatos; o match continua sendo substring
                 for d in search_domains:
-                    if d in self.memory_knowledge:
-                        for item in self.memory_knowledge[d]:
-                            content = item.get("content", "").lower()
-                            topic = item.get("topic", "").lower()
-                            if query.lower() in content or query.lower() in topic:
-                                results.append(item)
+                    index = self.memory_knowledge_index.get(d)
+                    if index:
+                        results.extend(index.search(q))
                 
                 return results
             
@@ -293,34 +694,67 @@ class LearningStore:
             logger.error(f"Error searching knowledge: {str(e)}")
             return []
     
-    async def update_knowledge_confidence(self, knowledge_id: str, delta: float) -> bool:
+    async def _query_knowledge(self, query: str, domain: Optional[str]) -> bytes:
+        """Busca textual na base de conhecimento no Cosmos, já serializada para o cache"""
+        return orjson.dumps([item async for item in self._stream_knowledge(query, domain)])
+    
+    async def _stream_knowledge(self, query: str, domain: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Itera a busca no Cosmos página a página
+        O slot de concorrência é ocupado só durante o fetch de cada página
+        """
+        params = [{"name": "@query", "value": query.lower()}]
+        
+        if domain:
+            cosmos_query = _Q_KNOWLEDGE_SEARCH_DOMAIN
+            params.append({"name": "@domain", "value": domain})
+        else:
+            cosmos_query = _Q_KNOWLEDGE_SEARCH
+        
+        pages = self.knowledge_container.query_items(
+            query=cosmos_query,
+            parameters=params
+        ).by_page()
+        
+        while True:
+            async with self._cosmos_slots:
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    return
+                items = [item async for item in page]
+            
+            for item in items:
+                yield item
+    
+    async def update_knowledge_confidence(self, knowledge_id: str, delta: float,
+                                          domain: Optional[str] = None) -> bool:
         """
         Atualiza confiança de um item de conhecimento
+        Com o domain informado usa leitura pontual em vez de query cross-partition
         """
         try:
+            await self._ensure_storage()
+            
             if self.knowledge_container:
-                # Buscar item
-                query = "SELECT * FROM c WHERE c.id = @id"
-                items = list(self.knowledge_container.query_items(
-                    query=query,
-                    parameters=[{"name": "@id", "value": knowledge_id}],
-                    enable_cross_partition_query=True
-                ))
+                if domain:
+                    # Patch parcial na partição: sem query e sem reescrever o documento
+                    new_confidence = await self._patch_confidence(knowledge_id, domain, delta)
+                else:
+                    item = await self._find_knowledge(knowledge_id)
+                    new_confidence = await self._replace_confidence(item, delta) if item else None
+                
+                if new_confidence is None:
+                    return False
                 
-                if items:
-                    item = items[0]
-                    current_confidence = item.get("confidence", 0.5)
-                    new_confidence = max(0.0, min(1.0, current_confidence + delta))
-                    item["confidence"] = new_confidence
-                    item["last_updated"] = datetime.now().isoformat()
-                    
-                    self.knowledge_container.upsert_item(item)
-                    logger.debug(f"Knowledge confidence updated: {knowledge_id} -> {new_confidence:.2f}")
-                    return True
+                self._invalidate_search_cache()
+                logger.debug(f"Knowledge confidence updated: {knowledge_id} -> {new_confidence:.2f}")
+                return True
             else:
                 # Atualizar em memória
-                for domain in self.memory_knowledge.values():
-                    for item in domain:
+                search_domains = [domain] if domain else self.memory_knowledge.keys()
+                for d in search_domains:
+                    for item in self.memory_knowledge.get(d, []):
                         if item.get("id") == knowledge_id:
                             current = item.get("confidence", 0.5)
                             item["confidence"] = max(0.0, min(1.0, current + delta))
@@ -333,10 +767,85 @@ class LearningStore:
             logger.error(f"Error updating knowledge confidence: {str(e)}")
             return False
     
+    async def _patch_confidence(self, knowledge_id: str, domain: str, delta: float) -> Optional[float]:
+        """
+        Incrementa confidence via patch_item
+        O filter_predicate só deixa o patch passar se o resultado ficar em [0, 1];
+        fora disso (ou item sem confidence) cai no read + replace com clamp
+        """
+        operations = [
+            {"op": "incr", "path": "/confidence", "value": delta},
+            {"op": "set", "path": "/last_updated", "value": datetime.now().isoformat()}
+        ]
+        bound = f"c.confidence + {delta:.10f}"
+        
+        try:
+            async with self._cosmos_slots:
+                item = await self.knowledge_container.patch_item(
+                    item=knowledge_id,
+                    partition_key=domain,
+                    patch_operations=operations,
+                    filter_predicate=f"FROM c WHERE {bound} >= 0 AND {bound} <= 1"
+                )
+            return item["confidence"]
+        except CosmosResourceNotFoundError:
+            return None
+        except CosmosAccessConditionFailedError:
+            try:
+                async with self._cosmos_slots:
+                    item = await self.knowledge_container.read_item(
+                        item=knowledge_id,
+                        partition_key=domain
+                    )
+            except CosmosResourceNotFoundError:
+                return None
+            return await self._replace_confidence(item, delta)
+    
+    async def _find_knowledge(self, knowledge_id: str) -> Optional[Dict[str, Any]]:
+        """Localiza item pelo id quando o domain (partição) não é conhecido"""
+        async with self._cosmos_slots:
+            async for item in self.knowledge_container.query_items(
+                query=_Q_KNOWLEDGE_BY_ID,
+                parameters=[{"name": "@id", "value": knowledge_id}],
+                max_item_count=1
+            ):
+                return item
+        return None
+    
+    async def _replace_confidence(self, item: Dict[str, Any], delta: float) -> float:
+        """
+        Read-modify-write com clamp em [0, 1], condicionado ao ETag lido
+        Se outro writer alterou o item no meio tempo, relê e tenta de novo
+        """
+        for attempt in range(_CONFIDENCE_RETRIES):
+            new_confidence = max(0.0, min(1.0, item.get("confidence", 0.5) + delta))
+            item["confidence"] = new_confidence
+            item["last_updated"] = datetime.now().isoformat()
+            
+            try:
+                async with self._cosmos_slots:
+                    await self.knowledge_container.replace_item(
+                        item=item["id"],
+                        body=item,
+                        etag=item.get("_etag"),
+                        match_condition=MatchConditions.IfNotModified
+                    )
+                return new_confidence
+            except CosmosAccessConditionFailedError:
+                if attempt == _CONFIDENCE_RETRIES - 1:
+                    raise
+                async with self._cosmos_slots:
+                    item = await self.knowledge_container.read_item(
+                        item=item["id"],
+                        partition_key=item["domain"]
+                    )
+    
     async def get_learning_stats(self) -> Dict[str, Any]:
         """
         Retorna estatísticas do storage de aprendizagem
         """
+        await self._ensure_storage()
+        
         stats = {
             "storage_type": "cosmos" if self.client else "memory",
             "available": self.available
@@ -344,27 +853,8 @@ class LearningStore:
         
         try:
             if self.profiles_container:
-                # Contar no Cosmos
-                count_query = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'user_profile'"
-                profile_count = list(self.profiles_container.query_items(
-                    query=count_query,
-                    enable_cross_partition_query=True
-                ))[0]
-                stats["total_profiles"] = profile_count
-                
-                pattern_count_query = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'pattern'"
-                pattern_count = list(self.patterns_container.query_items(
-                    query=pattern_count_query,
-                    enable_cross_partition_query=True
-                ))[0] if self.patterns_container else 0
-                stats["total_patterns"] = pattern_count
-                
-                knowledge_count_query = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'knowledge'"
-                knowledge_count = list(self.knowledge_container.query_items(
-                    query=knowledge_count_query,
-                    enable_cross_partition_query=True
-                ))[0] if self.knowledge_container else 0
-                stats["total_knowledge_items"] = knowledge_count
+                # Contar no Cosmos (snapshot em cache)
+                stats.update(await self._get_cosmos_counts())
             else:
                 # Contar em memória
                 stats["total_profiles"] = len(self.memory_profiles)
@@ -375,8 +865,47 @@ class LearningStore:
             logger.error(f"Error getting learning stats: {str(e)}")
             stats["error"] = str(e)
         
+        stats["writes_since_start"] = dict(self._write_counts)
+        
         return stats
     
+    async def _get_cosmos_counts(self) -> Dict[str, int]:
+        """
+        Contagens no Cosmos, recalculadas no máximo a cada stats_ttl segundos
+        O lock evita que chamadas concorrentes disparem as queries em paralelo
+        """
+        async with self._stats_lock:
+            now = time.monotonic()
+            if self._stats_snapshot and now - self._stats_snapshot[0] < self.stats_ttl:
+                return self._stats_snapshot[1]
+            
+            profile_count, pattern_count, knowledge_count = await asyncio.gather(
+                self._count_documents(self.profiles_container, "user_profile"),
+                self._count_documents(self.patterns_container, "pattern"),
+                self._count_documents(self.knowledge_container, "knowledge")
+            )
+            counts = {
+                "total_profiles": profile_count,
+                "total_patterns": pattern_count,
+                "total_knowledge_items": knowledge_count
+            }
+            
+            self._stats_snapshot = (now, counts)
+            return counts
+    
+    async def _count_documents(self, container, doc_type: str) -> int:
+        """Conta documentos de um tipo (query cross-partition)"""
+        if not container:
+            return 0
+        
+        async with self._cosmos_slots:
+            async for count in container.query_items(
+                query=_Q_COUNT_BY_TYPE,
+                parameters=[{"name": "@type", "value": doc_type}]
+            ):
+                return count
+        return 0
+    
     def is_available(self) -> bool:
         """Verifica se o storage está disponível"""
         return self.available
\ No newline at end of file
@@ -5,196 +5,345 @@ WFinance - Mesh Financial Analyst
 Porta padrão: 8000
 """
 import asyncio
-from contextlib import asynccontextmanager
-from typing import Dict, Any
-from fastapi import FastAPI, Depends, HTTPException
+import logging
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, TYPE_CHECKING
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Request
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
+from fastapi.responses import ORJSONResponse, Response
+from functools import lru_cache
+import orjson
+from pydantic import BaseModel, Field
 import os
+import sys
 
 # Setup logging first
 from utils.logger import setup_logging, get_logger
 setup_logging()
 
 # Then import other modules
+# Os componentes pesados (LLM SDKs, Azure, skills) são importados dentro do lifespan
 from config.settings import Settings, get_settings
-from core.brain import BotBrain
-from core.context_engine import ContextEngine
-from core.response_builder import ResponseBuilder
-from core.router import MessageRouter
-
-# NOVA ARQUITETURA - Apenas os módulos que existem
-from memory.memory_manager import MemoryManager
-from memory.learning import LearningSystem
-from memory.retrieval import RetrievalSystem
-
-from personality.personality_loader import PersonalityLoader
-from skills.skill_registry import SkillRegistry
 from utils.metrics import metrics_router
-from interfaces.bot_framework_handler import BotFrameworkHandler
+from utils.cache import TTLCache
+from utils.health_middleware import HealthCheckMiddleware
 
 logger = get_logger(__name__)
 
-# Global para armazenar componentes
-app_components = {}
+_BANNER_RULE = "=" * 60
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Gerencia o ciclo de vida da aplicação com cleanup otimizado."""
-    
-    # ===== STARTUP =====
-    logger.info("=" * 60)
-    logger.info("🚀 Starting Bot Framework v3.0.0...")
-    logger.info("=" * 60)
-    
+# Quanto /v1/messages espera o startup em background antes de responder 503
+STARTUP_WAIT_SECONDS = 30.0
+
+# Ambiente lido uma vez no import
+_BOT_ENV = os.getenv("BOT_ENV", "production")
+_IS_PROD: bool = _BOT_ENV.lower() == "production"
+_ENABLE_CORS: bool = os.getenv("ENABLE_CORS", "true").lower() == "true"
+
+if TYPE_CHECKING:
+    import httpx
+    from core.brain import BotBrain
+    from core.context_engine import ContextEngine
+    from core.response_builder import ResponseBuilder
+    from core.router import MessageRouter
+    from memory.memory_manager import MemoryManager
+    from memory.learning import LearningSystem
+    from memory.retrieval import RetrievalSystem
+    from personality.personality_loader import PersonalityLoader
+    from skills.skill_registry import SkillRegistry
+    from interfaces.bot_framework_handler import BotFrameworkHandler
+
+@dataclass(slots=True)
+class AppComponents:
+    """Componentes da aplicação (None até o startup inicializá-los)"""
+    settings: Optional[Settings] = None
+    # Nome do bot copiado das settings no startup (usado por / e /healthz)
+    bot_name: str = "Mesh"
+    memory_manager: Optional["MemoryManager"] = None
+    learning_system: Optional["LearningSystem"] = None
+    retrieval_system: Optional["RetrievalSystem"] = None
+    personality_loader: Optional["PersonalityLoader"] = None
+    skill_registry: Optional["SkillRegistry"] = None
+    http_client: Optional["httpx.AsyncClient"] = None
+    router: Optional["MessageRouter"] = None
+    response_builder: Optional["ResponseBuilder"] = None
+    context_engine: Optional["ContextEngine"] = None
+    brain: Optional["BotBrain"] = None
+    bot_framework: Optional["BotFrameworkHandler"] = None
+    llm_warmup_task: Optional[asyncio.Task] = None
+    # Startup em background (ver _deferred_init)
+    init_task: Optional[asyncio.Task] = None
+    init_done: Optional[asyncio.Event] = None
+    init_error: Optional[str] = None
+
+# Stats de storage e corpo do /healthz cacheados: probes não refazem o trabalho a cada request
+STORAGE_STATS_TTL = 3.0
+_stats_cache = TTLCache(maxsize=2, ttl=STORAGE_STATS_TTL)
+
+def _cached_storage_stats(components: AppComponents) -> Dict[str, Any]:
+    """get_storage_stats() do memory manager, reaproveitado por STORAGE_STATS_TTL segundos"""
+    stats = _stats_cache.get("storage")
+    if stats is None:
+        stats = components.memory_manager.get_storage_stats()
+        _stats_cache.set("storage", stats)
+    return stats
+
+async def _deferred_init(app: FastAPI, components: AppComponents):
+    """
+    Inicialização pesada dos componentes, rodando em background depois do bind do socket.
+    Sinaliza components.init_done ao terminar, com ou sem erro.
+    """
     try:
+        # Imports adiados: só pagos quando a aplicação realmente sobe
+        import httpx
+        from core.brain import BotBrain
+        from core.context_engine import ContextEngine
+        from core.response_builder import ResponseBuilder
+        from core.router import MessageRouter
+        
+        # NOVA ARQUITETURA - Apenas os módulos que existem
+        from memory.memory_manager import MemoryManager
+        from memory.learning import LearningSystem
+        from memory.retrieval import RetrievalSystem
+        
+        from personality.personality_loader import PersonalityLoader
+        from skills.skill_registry import SkillRegistry
+        
         # Carrega configurações
         logger.info("📋 Loading configuration...")
         settings = get_settings()
-        app_components['settings'] = settings
+        components.settings = settings
+        components.bot_name = settings.bot.name
         
         # Log configuração básica
         logger.info(f"   Bot Name: {settings.bot.name}")
         logger.info(f"   Bot Type: {settings.bot.type}")
-        logger.info(f"   Environment: {os.getenv('BOT_ENV', 'production')}")
+        logger.info(f"   Environment: {_BOT_ENV}")
         
-        # Inicializa componentes de memória - NOVA ARQUITETURA
+        # Componentes independentes entre si: inicializados em paralelo
+        # (construtores síncronos rodam em threads para sobrepor o I/O)
         logger.info("💾 Initializing memory systems...")
-        app_components['memory_manager'] = MemoryManager(settings)
-        
-        # Sistemas auxiliares
-        app_components['learning_system'] = LearningSystem(settings, None)
-        app_components['retrieval_system'] = RetrievalSystem(settings)
-        
-        # Inicializa personalidade
         logger.info("🎭 Loading personality...")
-        app_components['personality_loader'] = PersonalityLoader(settings)
-        
-        # Inicializa registro de skills
         logger.info("🎯 Loading skills...")
-        app_components['skill_registry'] = SkillRegistry(settings)
-        await app_components['skill_registry'].load_skills()
-        loaded_skills = app_components['skill_registry'].list_skills()
-        if loaded_skills:
-            logger.info(f"   Skills loaded: {', '.join(loaded_skills)}")
         
-        # Inicializa roteador e construtor de resposta
-        app_components['router'] = MessageRouter()
-        app_components['response_builder'] = ResponseBuilder(
-            settings,
-            app_components['personality_loader']
+        def _init_skills():
+            # Só o índice: cada skill é importado/instanciado no primeiro uso
+            registry = SkillRegistry(settings)
+            registry.load_index()
+            return registry
+        
+        (
+            components.memory_manager,
+            components.learning_system,
+            components.retrieval_system,
+            components.personality_loader,
+            components.skill_registry
+        ) = await asyncio.gather(
+            asyncio.to_thread(MemoryManager, settings),
+            asyncio.to_thread(LearningSystem, settings, None),
+            asyncio.to_thread(RetrievalSystem, settings),
+            asyncio.to_thread(PersonalityLoader, settings),
+            asyncio.to_thread(_init_skills)
         )
         
-        # Context engine simplificado
-        logger.info("🧩 Initializing context engine...")
-        app_components['context_engine'] = ContextEngine(
-            settings=settings,
-            short_term_memory=None,  # Removido na nova arquitetura
-            long_term_memory=None,   # Removido na nova arquitetura
-            learning_system=app_components['learning_system'],
-            retrieval_system=app_components['retrieval_system'],
-            personality_loader=app_components['personality_loader']
+        # Cliente HTTP único para chamadas de saída (LLM Azure + Bot Framework): pool de conexões compartilhado
+        components.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
         )
         
-        # Inicializa o cérebro do bot
+        loaded_skills = components.skill_registry.list_skills()
+        if loaded_skills:
+            logger.info(f"   Skills available: {', '.join(loaded_skills)}")
+        
+        # Inicializa roteador
+        components.router = MessageRouter()
+        
+        # Response builder, context engine e brain só dependem dos componentes acima:
+        # construtores síncronos (LLM SDKs, templates) rodam em threads, em paralelo
+        logger.info("🧩 Initializing context engine...")
         logger.info("🧠 Initializing bot brain...")
-        app_components['brain'] = BotBrain(
-            settings=settings,
-            memory_manager=app_components['memory_manager'],
-            learning_system=app_components['learning_system'],
-            retrieval_system=app_components['retrieval_system'],
-            skill_registry=app_components['skill_registry']
+        (
+            components.response_builder,
+            components.context_engine,
+            components.brain
+        ) = await asyncio.gather(
+            asyncio.to_thread(
+                ResponseBuilder,
+                settings,
+                components.personality_loader
+            ),
+            asyncio.to_thread(
+                ContextEngine,
+                settings=settings,
+                short_term_memory=None,  # Removido na nova arquitetura
+                long_term_memory=None,   # Removido na nova arquitetura
+                learning_system=components.learning_system,
+                retrieval_system=components.retrieval_system,
+                personality_loader=components.personality_loader
+            ),
+            asyncio.to_thread(
+                BotBrain,
+                settings=settings,
+                memory_manager=components.memory_manager,
+                learning_system=components.learning_system,
+                retrieval_system=components.retrieval_system,
+                skill_registry=components.skill_registry,
+                http_client=components.http_client
+            )
         )
         
+        # Aquece a conexão do provider primário em background (primeiro request sem handshake TLS)
+        if components.brain.primary_provider:
+            components.llm_warmup_task = asyncio.create_task(components.brain.primary_provider.warmup())
+        
+        # Conecta o Learning Store já no startup (containers + warm-up das conexões)
+        learning_engine = getattr(components.brain, 'learning_engine', None)
+        if learning_engine:
+            await learning_engine.learning_store.initialize()
+        
         # Verifica status dos providers
-        _log_provider_status()
+        _log_provider_status(components)
         
         # Inicializa Bot Framework Handler para Azure Bot Service/Teams
         if settings.teams and settings.teams.app_id:
+            # Importado só quando o Teams está configurado (deploys só-HTTP não pagam o import)
+            from interfaces.bot_framework_handler import BotFrameworkHandler
+            
             logger.info("🤖 Initializing Bot Framework handler for Teams...")
-            app_components['bot_framework'] = BotFrameworkHandler(
+            components.bot_framework = await asyncio.to_thread(
+                BotFrameworkHandler,
                 settings=settings,
-                brain=app_components['brain']
+                brain=components.brain,
+                http_client=components.http_client
             )
             
-            # IMPORTANTE: Registrar as rotas do Bot Framework IMEDIATAMENTE
-            # Não esperar pelo startup event
-            app.include_router(app_components['bot_framework'].router)
-            logger.info("   ✅ Bot Framework router registered")
+            # Rota /api/messages já é estática (bot_framework_router); aqui só liga o handler
             logger.info("   ✅ Bot Framework endpoint ready at /api/messages")
             
-            # Debug: listar todas as rotas registradas
-            for route in app.routes:
-                if hasattr(route, 'path') and hasattr(route, 'methods'):
-                    if route.methods:
-                        logger.debug(f"   Route: {route.methods} {route.path}")
         else:
             logger.warning("   ⚠️ Teams not configured - Bot Framework handler disabled")
         
         # Verifica Memory Manager
-        memory_stats = app_components['memory_manager'].get_storage_stats()
-        logger.info(f"💾 Memory Manager Status: {memory_stats['health']}")
+        memory_stats = components.memory_manager.get_storage_stats()
+        lines = [f"💾 Memory Manager Status: {memory_stats['health']}"]
         for provider, status in memory_stats['providers'].items():
             status_icon = '✅' if status['available'] else '❌'
-            logger.info(f"   {provider}: {status_icon} ({status['type']})")
-        
-        logger.info("=" * 60)
-        logger.info("✅ Bot Framework started successfully!")
-        logger.info(f"   Version: 3.0.0")
-        logger.info(f"   Architecture: Memory Manager + Learning System")
-        logger.info(f"   Ready to receive messages on port 8000")
-        logger.info("=" * 60)
+            lines.append(f"   {provider}: {status_icon} ({status['type']})")
         
-        yield
+        lines += [
+            _BANNER_RULE,
+            "✅ Bot Framework started successfully!",
+            "   Version: 3.0.0",
+            "   Architecture: Memory Manager + Learning System",
+            "   Ready to receive messages on port 8000",
+            _BANNER_RULE
+        ]
+        logger.info("\n".join(lines))
         
     except Exception as e:
-        logger.error("=" * 60)
-        logger.error(f"❌ Failed to start Bot Framework: {str(e)}")
-        logger.error("=" * 60)
-        raise
+        components.init_error = str(e)
+        logger.error("\n".join([_BANNER_RULE, f"❌ Failed to start Bot Framework: {str(e)}", _BANNER_RULE]))
+    finally:
+        # Health cacheado durante o startup já não vale
+        _stats_cache.clear()
+        components.init_done.set()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Gerencia o ciclo de vida da aplicação com cleanup otimizado."""
+    
+    # ===== STARTUP =====
+    # Componentes vivem em app.state (único ponto de registro, lido pelos endpoints via Depends)
+    components = AppComponents(init_done=asyncio.Event())
+    app.state.components = components
+    _stats_cache.clear()
+    
+    # Banners saem num único emit (uma formatação/escrita em vez de uma por linha)
+    logger.info("\n".join([_BANNER_RULE, "🚀 Starting Bot Framework v3.0.0...", _BANNER_RULE]))
+    
+    # Init pesado em background: o socket já aceita conexões (liveness responde)
+    # enquanto memória, skills e LLMs sobem; readiness e /v1/messages esperam components.init_done
+    components.init_task = asyncio.create_task(_deferred_init(app, components))
+    
+    yield
     
     # ===== SHUTDOWN =====
-    logger.info("=" * 60)
-    logger.info("🛑 Shutting down Bot Framework...")
+    logger.info("\n".join([_BANNER_RULE, "🛑 Shutting down Bot Framework..."]))
+    
+    # Startup ainda em andamento: interrompe antes do cleanup
+    if not components.init_task.done():
+        components.init_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await components.init_task
     
     # Cleanup otimizado - sem chamar métodos que não existem
     try:
         # Log estatísticas finais se disponível
-        if 'brain' in app_components and hasattr(app_components['brain'], 'get_memory_stats'):
-            stats = app_components['brain'].get_memory_stats()
+        if components.brain is not None and hasattr(components.brain, 'get_memory_stats'):
+            stats = components.brain.get_memory_stats()
             logger.info(f"   Final memory stats: {stats.get('health', 'unknown')}")
+
+        # Persiste perfis de aprendizagem ainda pendentes (write-coalescing)
+        learning_engine = getattr(components.brain, 'learning_engine', None)
+        if learning_engine:
+            flushed = await learning_engine.close()
+            logger.info(f"   Learning profiles flushed: {flushed}")
+
+        if components.llm_warmup_task is not None and not components.llm_warmup_task.done():
+            components.llm_warmup_task.cancel()
+
+        if components.bot_framework is not None:
+            await components.bot_framework.close()
         
-        # Nota: Clientes HTTP (Azure OpenAI e Anthropic) fazem cleanup automático
-        # Não é necessário fechar manualmente
+        # Fecha o pool HTTP compartilhado
+        # Nota: Clientes dos providers (Azure OpenAI e Anthropic) fazem cleanup automático
+        if components.http_client is not None:
+            await components.http_client.aclose()
         
-        logger.info("✅ Shutdown completed gracefully")
+        logger.info("\n".join(["✅ Shutdown completed gracefully", _BANNER_RULE]))
         
     except Exception as e:
         logger.warning(f"⚠️ Cleanup warning (non-critical): {str(e)}")
+        logger.info(_BANNER_RULE)
     
-    logger.info("=" * 60)
+    finally:
+        # Clientes Cosmos compartilhados do Learning Store (só existem se o módulo foi carregado)
+        learning_store_module = sys.modules.get("learning.storage.learning_store")
+        if learning_store_module is not None:
+            await learning_store_module.close_cosmos_clients()
 
-def _log_provider_status():
+def _log_provider_status(components: AppComponents):
     """Helper para logar status dos LLM providers."""
-    if 'brain' not in app_components:
+    if components.brain is None:
         return
     
-    brain = app_components['brain']
+    brain = components.brain
     
-    logger.info("🤖 LLM Providers Status:")
+    lines = ["🤖 LLM Providers Status:"]
+    # Um emit só, no nível do pior status
+    level = logging.INFO
     
     if brain.primary_provider and brain.primary_provider.is_available():
-        logger.info("   ✅ Primary (Azure OpenAI): Available")
+        lines.append("   ✅ Primary (Azure OpenAI): Available")
     else:
-        logger.warning("   ❌ Primary (Azure OpenAI): Not configured")
+        lines.append("   ❌ Primary (Azure OpenAI): Not configured")
+        level = logging.WARNING
     
     if brain.fallback_provider and brain.fallback_provider.is_available():
-        logger.info("   ✅ Fallback (Claude): Available")
+        lines.append("   ✅ Fallback (Claude): Available")
     else:
-        logger.warning("   ⚠️ Fallback (Claude): Not configured")
+        lines.append("   ⚠️ Fallback (Claude): Not configured")
+        level = logging.WARNING
     
     if not brain.primary_provider and not brain.fallback_provider:
-        logger.error("   ⚠️ WARNING: No LLM providers available!")
+        lines.append("   ⚠️ WARNING: No LLM providers available!")
+        level = logging.ERROR
+    
+    logger.log(level, "\n".join(lines))
 
 # Cria a aplicação FastAPI
 app = FastAPI(
@@ -203,33 +352,30 @@ app = FastAPI(
     version="3.0.0",
     lifespan=lifespan,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware - configuração mais segura para produção
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "https://teams.microsoft.com",
-        "https://*.teams.microsoft.com",
-        "https://*.azurewebsites.net",
-        "http://localhost:3000",  # Para desenvolvimento
-        "http://localhost:8000"   # Para desenvolvimento
-    ],
-    allow_credentials=True,
-    allow_methods=["GET", "POST"],
-    allow_headers=["*"],
-)
+# Vazio até o lifespan registrar os componentes
+app.state.components = AppComponents()
+
+def get_components(request: Request) -> AppComponents:
+    """Dependency: componentes registrados em app.state"""
+    return request.app.state.components
 
 # Inclui rotas de métricas
 app.include_router(metrics_router)
 
-@app.get("/")
-async def root():
-    """Endpoint raiz com informações do sistema."""
-    return {
+# Rotas agrupadas por prefixo; as de teste só são registradas fora de produção
+v1_router = APIRouter(prefix="/v1")
+debug_router = APIRouter(prefix="/test")
+
+@lru_cache(maxsize=2)
+def _root_bytes(bot_name: str) -> bytes:
+    """Corpo de / já serializado: só o nome do bot varia (antes/depois do startup)"""
+    return orjson.dumps({
         "message": "Bot Framework is running",
-        "bot": app_components.get('settings', {}).bot.name if 'settings' in app_components else "Mesh",
+        "bot": bot_name,
         "version": "3.0.0",
         "status": "healthy",
         "endpoints": {
@@ -239,73 +385,165 @@ async def root():
             "metrics": "/metrics",
             "docs": "/docs"
         }
-    }
+    })
 
-@app.get("/healthz")
-async def health_check():
-    """
-    Health check endpoint.
-    Verifica o status de todos os componentes críticos.
-    """
+_JSON = b"application/json"
+
+def root(fastapi_app: FastAPI):
+    """Endpoint raiz com informações do sistema."""
+    return 200, _JSON, _root_bytes(fastapi_app.state.components.bot_name)
+
+def liveness(fastapi_app: FastAPI):
+    """Liveness probe barato: sem checagens nem JSON (status detalhado em /healthz)"""
+    return 200, b"text/plain; charset=utf-8", b"ok"
+
+def _is_ready(components: AppComponents) -> bool:
+    """Startup concluído sem erro (sem lifespan, basta o brain existir)"""
+    if components.init_done is None:
+        return components.brain is not None
+    return components.init_done.is_set() and components.init_error is None and components.brain is not None
+
+def _health_status(components: AppComponents) -> Dict[str, Any]:
+    """Monta o status de todos os componentes críticos"""
     health_status = {
         "status": "ok",
-        "bot": app_components.get('settings', {}).bot.name if 'settings' in app_components else "Mesh",
+        "bot": components.bot_name,
         "version": "3.0.0",
         "components": {}
     }
     
+    # Startup em background
+    if components.init_error is not None:
+        health_status["components"]["startup"] = "failed"
+        health_status["status"] = "degraded"
+    elif components.init_done is not None and not components.init_done.is_set():
+        health_status["components"]["startup"] = "in_progress"
+    
     # Verifica Brain
-    if 'brain' in app_components:
+    if components.brain is not None:
         health_status["components"]["brain"] = "healthy"
     else:
         health_status["components"]["brain"] = "not_initialized"
         health_status["status"] = "degraded"
     
     # Verifica Memory Manager
-    if 'memory_manager' in app_components:
+    if components.memory_manager is not None:
         try:
-            stats = app_components['memory_manager'].get_storage_stats()
+            stats = _cached_storage_stats(components)
             health_status["components"]["memory"] = stats.get('health', 'unknown')
-        except:
+        except Exception:
             health_status["components"]["memory"] = "error"
     
     # Verifica Bot Framework
-    if 'bot_framework' in app_components:
+    if components.bot_framework is not None:
         health_status["components"]["teams"] = "healthy"
         health_status["components"]["bot_framework_configured"] = bool(
-            hasattr(app_components['bot_framework'], 'app_id') and 
-            app_components['bot_framework'].app_id
+            hasattr(components.bot_framework, 'app_id') and 
+            components.bot_framework.app_id
         )
     else:
         health_status["components"]["teams"] = "not_configured"
     
     return health_status
 
-@app.get("/v1/memory/stats")
-async def get_memory_stats():
+def _cached_health_body(components: AppComponents) -> bytes:
+    """Corpo do health já serializado, refeito no máximo a cada STORAGE_STATS_TTL segundos"""
+    body = _stats_cache.get("healthz")
+    if body is None:
+        body = orjson.dumps(_health_status(components))
+        _stats_cache.set("healthz", body)
+    return body
+
+def health_check(fastapi_app: FastAPI):
+    """
+    Health check endpoint.
+    Verifica o status de todos os componentes críticos.
+    """
+    return 200, _JSON, _cached_health_body(fastapi_app.state.components)
+
+def readiness(fastapi_app: FastAPI):
+    """
+    Readiness probe: mesmo conteúdo do /healthz, mas 503 enquanto o brain não estiver pronto
+    Corpo montado na hora (sem o cache do /healthz) para bater com o status code
+    """
+    components = fastapi_app.state.components
+    return (200 if _is_ready(components) else 503), _JSON, orjson.dumps(_health_status(components))
+
+# Probes e / respondidos por um middleware ASGI puro, antes do roteamento.
+# Adicionado antes do CORS para o CORS ficar por fora e continuar anotando essas respostas.
+# Por não serem rotas FastAPI, esses paths não aparecem no OpenAPI (/docs)
+app.add_middleware(
+    HealthCheckMiddleware,
+    handlers={
+        "/": root,
+        "/livez": liveness,
+        "/healthz/live": liveness,
+        "/healthz": health_check,
+        "/healthz/ready": readiness,
+    }
+)
+
+# CORS middleware - configuração mais segura para produção
+# ENABLE_CORS=false quando o gateway (APIM/ingress) já responde CORS: um middleware a menos por request
+if _ENABLE_CORS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "https://teams.microsoft.com",
+            "http://localhost:3000",  # Para desenvolvimento
+            "http://localhost:8000"   # Para desenvolvimento
+        ],
+        # Subdomínios: allow_origins não aceita curingas, então vão num regex (compilado uma vez)
+        allow_origin_regex=r"https://[^/]+\.(teams\.microsoft\.com|azurewebsites\.net)",
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["*"],
+    )
+
+@v1_router.get("/memory/stats")
+async def get_memory_stats(components: AppComponents = Depends(get_components)):
     """Endpoint para obter estatísticas de memória."""
-    if 'memory_manager' not in app_components:
+    if components.memory_manager is None:
         raise HTTPException(status_code=503, detail="Memory manager not initialized")
     
     try:
-        stats = app_components['memory_manager'].get_storage_stats()
-        return stats
+        stats = _cached_storage_stats(components)
+        # Serializado aqui dentro do try: erro de serialização vira 500, não corpo truncado
+        return ORJSONResponse(stats)
     except Exception as e:
         logger.error(f"Error getting memory stats: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/v1/messages")
-async def handle_message(request: Dict[str, Any]):
+class MessageRequest(BaseModel):
+    """Corpo de /v1/messages (user_id/message ausentes ou vazios retornam 400)"""
+    user_id: str = Field(min_length=1)
+    message: str = Field(min_length=1)
+    channel: str = "http"
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+# Campos cuja falha de validação mantém o 400 do contrato original de /v1/messages
+_MESSAGE_REQUIRED_LOCS = {("body", "user_id"), ("body", "message")}
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """/v1/messages sem user_id/message continua respondendo 400; o resto segue o 422 padrão"""
+    errors = exc.errors()
+    if request.url.path == "/v1/messages" and errors and all(
+        tuple(error["loc"]) in _MESSAGE_REQUIRED_LOCS for error in errors
+    ):
+        return ORJSONResponse(status_code=400, content={"detail": "user_id and message are required"})
+    return await request_validation_exception_handler(request, exc)
+
+@v1_router.post("/messages")
+async def handle_message(
+    request: MessageRequest,
+    components: AppComponents = Depends(get_components)
+):
     """
     Endpoint principal para processar mensagens.
     
     Args:
-        request: {
-            "user_id": str,
-            "message": str,
-            "channel": str (optional),
-            "metadata": dict (optional)
-        }
+        request: MessageRequest (user_id, message, channel, metadata)
     
     Returns:
         {
@@ -314,52 +552,49 @@ async def handle_message(request: Dict[str, Any]):
             "metadata": dict
         }
     """
-    if 'brain' not in app_components:
+    # Startup ainda em background: espera um pouco antes de responder 503
+    if components.init_done is not None and not components.init_done.is_set():
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(components.init_done.wait(), timeout=STARTUP_WAIT_SECONDS)
+    
+    # Startup falhou: 503 imediato, não adianta esperar
+    if components.init_error is not None:
         raise HTTPException(
-            status_code=503, 
-            detail="Bot brain not initialized. Please wait for startup to complete."
+            status_code=503,
+            detail=f"Bot startup failed: {components.init_error}"
         )
     
-    # Validação de entrada
-    user_id = request.get("user_id")
-    message = request.get("message")
-    
-    if not user_id or not message:
+    if components.brain is None:
         raise HTTPException(
-            status_code=400, 
-            detail="user_id and message are required"
+            status_code=503, 
+            detail="Bot brain not initialized. Please wait for startup to complete."
         )
     
-    # Processa mensagem
+    # Processa mensagem (try só em volta da chamada ao cérebro)
+    brain = components.brain
     try:
-        brain = app_components['brain']
-        channel = request.get("channel", "http")
-        metadata = request.get("metadata", {})
-        
-        # Chama o cérebro do bot
         response = await brain.think(
-            user_id=user_id, 
-            message=message, 
-            channel=channel,
-            metadata=metadata
+            user_id=request.user_id, 
+            message=request.message, 
+            channel=request.channel,
+            metadata=request.metadata
         )
-        
-        return response
-        
     except Exception as e:
         logger.error(f"Error processing message: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return response
 
-@app.get("/v1/users/{user_id}/insights")
-async def get_user_insights(user_id: str):
+@v1_router.get("/users/{user_id}/insights")
+async def get_user_insights(user_id: str, components: AppComponents = Depends(get_components)):
     """
     Obtém insights sobre um usuário baseado no histórico.
     """
-    if 'learning_system' not in app_components:
+    if components.learning_system is None:
         raise HTTPException(status_code=503, detail="Learning system not initialized")
     
     try:
-        insights = await app_components['learning_system'].get_user_insights(user_id)
+        insights = await components.learning_system.get_user_insights(user_id)
         return {
             "user_id": user_id,
             "insights": insights
@@ -368,29 +603,46 @@ async def get_user_insights(user_id: str):
         logger.error(f"Error getting user insights: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/test/message")
-async def test_message():
+@debug_router.post("/message")
+async def test_message(components: AppComponents = Depends(get_components)):
     """
     Endpoint de teste para enviar uma mensagem de exemplo.
-    Desabilitado em produção.
+    Desabilitado em produção (rota nem é registrada).
     """
+    test_request = MessageRequest(
+        user_id="test_user",
+        message="Olá Mesh, como você está funcionando?",
+        channel="test"
+    )
     
-    if os.getenv("BOT_ENV", "production").lower() == "production":
-        raise HTTPException(
-            status_code=403,
-            detail="Test endpoint disabled in production"
-        )
-    
-    test_request = {
-        "user_id": "test_user",
-        "message": "Olá Mesh, como você está funcionando?",
-        "channel": "test"
-    }
-    
-    return await handle_message(test_request)
+    return await handle_message(test_request, components)
+
+# Bot Framework (Teams): rota fixa desde o import; o handler é ligado no startup se o Teams estiver configurado
+bot_framework_router = APIRouter()
+
+@bot_framework_router.post("/api/messages")
+async def bot_framework_messages(request: Request, components: AppComponents = Depends(get_components)) -> Response:
+    """Encaminha activities do Azure Bot Service para o BotFrameworkHandler"""
+    if components.bot_framework is None:
+        if components.init_done is not None and not components.init_done.is_set():
+            return Response(status_code=503)
+        return Response(status_code=404)
+    return await components.bot_framework.handle_messages(request)
+
+@bot_framework_router.options("/api/messages")
+async def bot_framework_options() -> Response:
+    """Handle OPTIONS requests for CORS"""
+    return Response(status_code=200)
+
+app.include_router(v1_router)
+app.include_router(bot_framework_router)
+if not _IS_PROD:
+    app.include_router(debug_router)
 
 # IMPORTANTE: Usar porta padrão 8000
 if __name__ == "__main__":
+    import uvicorn
+    
     # Define a porta padrão como 8000 (padrão FastAPI)
     port = int(os.getenv("PORT", "8000"))
     
@@ -400,6 +652,17 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=False,
-        log_level="info"
+        # Reloader (processo supervisor extra) só em desenvolvimento
+        reload=_BOT_ENV.lower() in ("dev", "development"),
+        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+        # Access log por request desligado: métricas/logs estruturados já cobrem
+        access_log=False,
+        # Sem config própria do uvicorn: seus logs seguem pelo handler de fila do root
+        log_config=None,
+        # uvloop/httptools vêm com uvicorn[standard]
+        loop="uvloop",
+        http="httptools",
+        # Sem rotas websocket: não carrega o protocolo
+        ws="none",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
     )
\ No newline at end of file
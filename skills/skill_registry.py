@@ -1,18 +1,36 @@
 from typing import Dict, List, Any, Optional
 import importlib
 from skills.base_skill import BaseSkill
-from skills.api_caller import APICallerSkill
-from skills.report_generator import ReportGeneratorSkill
-from skills.image_generator import ImageGeneratorSkill
 from config.settings import Settings
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Skills embutidos: nome -> (módulo, classe), importados só quando instanciados
+BUILTIN_SKILLS = {
+    "api_caller": ("skills.api_caller", "APICallerSkill"),
+    "report_generator": ("skills.report_generator", "ReportGeneratorSkill"),
+    "image_generator": ("skills.image_generator", "ImageGeneratorSkill"),
+}
+
 class SkillRegistry:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.skills: Dict[str, BaseSkill] = {}
+        # Skills habilitados ainda não instanciados (nome -> config)
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # Skills que falharam ao carregar (nome -> erro): não são tentados de novo
+        self.failed_skills: Dict[str, str] = {}
+    
+    def load_index(self):
+        """Index enabled skills without importing or instantiating them"""
+        skill_configs = self.settings.skills.get("registry", [])
+        
+        for skill_config in skill_configs:
+            if skill_config.get("enabled", False):
+                self._index[skill_config["name"]] = skill_config
+        
+        logger.info(f"Indexed {len(self._index)} skills", skill_names=list(self._index.keys()))
     
     async def load_skills(self):
         """Load all enabled skills from configuration"""
@@ -26,29 +44,37 @@ class SkillRegistry:
     
     async def _load_skill(self, skill_config: Dict[str, Any]):
         """Load a single skill"""
+        self._create_skill(skill_config)
+    
+    def _create_skill(self, skill_config: Dict[str, Any]) -> Optional[BaseSkill]:
+        """Import, instantiate and register a single skill"""
         skill_name = skill_config["name"]
         config = skill_config.get("config", {})
+        # Sai do índice já na primeira tentativa, com sucesso ou não
+        self._index.pop(skill_name, None)
         
         try:
-            if skill_name == "api_caller":
-                skill_instance = APICallerSkill(config)
-            elif skill_name == "report_generator":
-                skill_instance = ReportGeneratorSkill(config)
-            elif skill_name == "image_generator":
-                skill_instance = ImageGeneratorSkill(config)
+            if skill_name in BUILTIN_SKILLS:
+                module_name, class_name = BUILTIN_SKILLS[skill_name]
+                skill_class = getattr(importlib.import_module(module_name), class_name)
+                skill_instance = skill_class(config)
             else:
                 # Try to load custom skill
-                skill_instance = await self._load_custom_skill(skill_name, config)
+                skill_instance = self._load_custom_skill(skill_name, config)
             
             if skill_instance:
                 self.skills[skill_name] = skill_instance
                 logger.debug(f"Loaded skill: {skill_name}")
             else:
+                self.failed_skills[skill_name] = "not found"
                 logger.warning(f"Failed to load skill: {skill_name}")
+            return skill_instance
         except Exception as e:
+            self.failed_skills[skill_name] = str(e)
             logger.error(f"Error loading skill {skill_name}: {str(e)}")
+            return None
     
-    async def _load_custom_skill(self, skill_name: str, config: Dict[str, Any]) -> Optional[BaseSkill]:
+    def _load_custom_skill(self, skill_name: str, config: Dict[str, Any]) -> Optional[BaseSkill]:
         """Load a custom skill from external module"""
         try:
             # Try to import the skill module
@@ -66,11 +92,18 @@ class SkillRegistry:
             return None
     
     def get_skill(self, skill_name: str) -> Optional[BaseSkill]:
-        """Get a skill by name"""
-        return self.skills.get(skill_name)
+        """Get a skill by name, instantiating it on first use"""
+        skill = self.skills.get(skill_name)
+        if skill is None and skill_name in self._index:
+            skill = self._create_skill(self._index[skill_name])
+        return skill
     
     async def find_appropriate_skill(self, intent: str, context: Dict[str, Any]) -> Optional[BaseSkill]:
         """Find the most appropriate skill for the given intent"""
+        # can_handle precisa das instâncias: materializa o que ainda está só no índice
+        for skill_name in list(self._index.keys()):
+            self.get_skill(skill_name)
+        
         for skill_name, skill in self.skills.items():
             if await skill.can_handle(intent, context):
                 return skill
@@ -78,5 +111,5 @@ class SkillRegistry:
         return None
     
     def list_skills(self) -> List[str]:
-        """List all loaded skills"""
-        return list(self.skills.keys())
\ No newline at end of file
+        """List all available skills (loaded or indexed)"""
+        return list(self.skills.keys()) + list(self._index.keys())
\ No newline at end of file
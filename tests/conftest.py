@@ -0,0 +1,87 @@
+import importlib.util
+import sys
+import types
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from config.settings import Settings
+
+
+def _install_user_profile_fallback():
+    """
+    learning/models ainda não está no repositório e learning/__init__ importa UserProfile dele.
+    Sem o módulo real, registra um UserProfile mínimo só para os testes do pacote learning.
+    """
+    # Checa pelo caminho: importar o pacote learning aqui dispararia o próprio erro
+    if (Path(__file__).resolve().parents[1] / "learning" / "models").is_dir():
+        return
+
+    class UserProfile:
+        def __init__(self, user_id: str):
+            self.user_id = user_id
+            self.interactions = 0
+            self.profile_confidence = 0.5
+            self.last_updated = datetime.now()
+
+        @classmethod
+        def from_dict(cls, data):
+            profile = cls(data["user_id"])
+            profile.interactions = data.get("interactions", 0)
+            return profile
+
+        def update_from_interaction(self, message, response, metadata):
+            self.interactions += 1
+            self.last_updated = datetime.now()
+
+        def add_feedback(self, score):
+            pass
+
+        def to_dict(self):
+            return {"user_id": self.user_id, "interactions": self.interactions}
+
+    models = types.ModuleType("learning.models")
+    user_profile = types.ModuleType("learning.models.user_profile")
+    user_profile.UserProfile = UserProfile
+    user_profile.CommunicationStyle = user_profile.ResponsePreference = object
+    models.user_profile = user_profile
+    sys.modules["learning.models"] = models
+    sys.modules["learning.models.user_profile"] = user_profile
+
+
+def _install_llm_package_alias():
+    """
+    O código importa core.llm, mas o pacote no disco é core/LLM (só resolve em FS case-insensitive).
+    Carrega o pacote real sob o nome core.llm para os testes rodarem em Linux.
+    """
+    core_dir = Path(__file__).resolve().parents[1] / "core"
+    if (core_dir / "llm").is_dir() or "core.llm" in sys.modules:
+        return
+
+    # Sem importar core antes: core/__init__ já importa core.brain -> core.llm
+    llm_dir = core_dir / "LLM"
+    spec = importlib.util.spec_from_file_location(
+        "core.llm", llm_dir / "__init__.py", submodule_search_locations=[str(llm_dir)]
+    )
+    llm = importlib.util.module_from_spec(spec)
+    sys.modules["core.llm"] = llm
+    spec.loader.exec_module(llm)
+
+
+_install_user_profile_fallback()
+_install_llm_package_alias()
+
+
+@pytest.fixture
+def learning_settings():
+    """Settings sem Cosmos (Learning Store em memória) e janelas de flush curtas"""
+    settings = Settings.from_yaml("bot_config.yaml")
+    settings.cosmos.endpoint = None
+    settings.cosmos.key = None
+    settings.memory.learning.update({
+        "flush_interval_seconds": 0.01,
+        "flush_max_backoff_seconds": 0.05,
+        "pattern_flush_interval_seconds": 0.01,
+    })
+    return settings
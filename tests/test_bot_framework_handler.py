@@ -0,0 +1,19 @@
+import httpx
+import pytest
+
+from config.settings import Settings
+from interfaces.bot_framework_handler import BotFrameworkHandler
+
+
+@pytest.mark.asyncio
+async def test_close_only_closes_owned_client():
+    """O cliente injetado continua aberto; o criado pelo handler é fechado"""
+    settings = Settings.from_yaml("bot_config.yaml")
+    async with httpx.AsyncClient() as shared:
+        handler = BotFrameworkHandler(settings=settings, brain=None, http_client=shared)
+        await handler.close()
+        assert not shared.is_closed
+
+    handler = BotFrameworkHandler(settings=settings, brain=None)
+    await handler.close()
+    assert handler.http_client.is_closed
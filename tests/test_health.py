@@ -26,4 +26,44 @@ def test_message_endpoint():
     )
     assert response.status_code == 200
     assert "response" in response.json()
-    assert "metadata" in response.json()
\ No newline at end of file
+    assert "metadata" in response.json()
+
+
+def test_message_endpoint_requires_user_and_message():
+    """Missing or empty user_id/message keep returning 400"""
+    for body in ({"user_id": "testuser"}, {"message": "Hello"}, {"user_id": "", "message": "Hello"}):
+        response = client.post("/v1/messages", json=body)
+        assert response.status_code == 400
+        assert response.json() == {"detail": "user_id and message are required"}
+
+
+def test_message_endpoint_rejects_malformed_body():
+    """Other validation errors still use FastAPI's 422"""
+    response = client.post("/v1/messages", json={"user_id": "u", "message": "m", "metadata": "x"})
+    assert response.status_code == 422
+
+
+def _failed_startup_components():
+    """Components of a background startup that failed"""
+    import asyncio
+    from main import AppComponents
+    components = AppComponents(init_done=asyncio.Event(), init_error="boom")
+    components.init_done.set()
+    return components
+
+
+def test_message_endpoint_fails_fast_after_startup_error(monkeypatch):
+    """A failed startup answers 503 right away instead of waiting"""
+    monkeypatch.setattr(app.state, "components", _failed_startup_components())
+    response = client.post("/v1/messages", json={"user_id": "testuser", "message": "Hello"})
+    assert response.status_code == 503
+    assert "boom" in response.json()["detail"]
+
+
+def test_readiness_body_matches_status(monkeypatch):
+    """Readiness status and body come from the same (uncached) state"""
+    client.get("/healthz")  # fill the /healthz cache with the current state
+    monkeypatch.setattr(app.state, "components", _failed_startup_components())
+    response = client.get("/healthz/ready")
+    assert response.status_code == 503
+    assert response.json()["components"]["startup"] == "failed"
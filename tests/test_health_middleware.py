@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from utils.health_middleware import HealthCheckMiddleware
+
+
+def _ok(app):
+    return 200, b"application/json", b'{"status":"ok"}'
+
+def _not_ready(app):
+    return 503, b"application/json", b'{"status":"starting"}'
+
+async def _downstream(request):
+    return PlainTextResponse("downstream")
+
+app = Starlette(
+    routes=[Route("/other", _downstream)],
+    middleware=[Middleware(HealthCheckMiddleware, handlers={"/healthz": _ok, "/healthz/ready": _not_ready})],
+)
+client = TestClient(app)
+
+@pytest.mark.parametrize("path,status,body", [
+    ("/healthz", 200, b'{"status":"ok"}'),
+    ("/healthz/ready", 503, b'{"status":"starting"}'),
+])
+def test_get_returns_handler_response(path, status, body):
+    """GET devolve status e corpo do handler, com content-type e content-length"""
+    response = client.get(path)
+    assert response.status_code == status
+    assert response.content == body
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-length"] == str(len(body))
+
+@pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+def test_other_methods_get_405(method):
+    """Métodos diferentes de GET recebem 405 com Allow: GET"""
+    response = client.request(method, "/healthz")
+    assert response.status_code == 405
+    assert response.headers["allow"] == "GET"
+    assert response.headers["content-length"] == str(len(response.content))
+    assert response.json() == {"detail": "Method Not Allowed"}
+
+def test_other_paths_pass_through():
+    """Paths sem handler seguem para a aplicação"""
+    response = client.get("/other")
+    assert response.status_code == 200
+    assert response.text == "downstream"
+
+def test_main_app_keeps_cors_on_probes():
+    """No app principal o CORS envolve o middleware de health"""
+    from main import app as main_app
+    response = TestClient(main_app).get("/livez", headers={"Origin": "https://teams.microsoft.com"})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "https://teams.microsoft.com"
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from learning.core.learning_engine import LearningEngine
+
+
+async def _wait_for(condition, timeout=2.0):
+    """Espera a condição virar verdadeira (tasks de flush rodam em background)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timeout"
+        await asyncio.sleep(0.005)
+
+
+class _MemoryManager:
+    async def get_conversation_history(self, user_id, limit=10):
+        return []
+
+
+@pytest.fixture
+def engine(learning_settings):
+    engine = LearningEngine(learning_settings, _MemoryManager())
+    engine.saved = []
+    save_profile = engine.learning_store.save_profile
+
+    async def recording_save(profile):
+        engine.saved.append(profile.user_id)
+        return await save_profile(profile)
+
+    engine.learning_store.save_profile = recording_save
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_interactions_in_window(engine):
+    """Várias interações na mesma janela viram um save por usuário"""
+    for i in range(10):
+        await engine.learn_from_interaction(f"user{i % 2}", "oi", "olá", {})
+
+    assert engine.saved == []
+    await _wait_for(lambda: engine._flush_task.done())
+
+    assert sorted(engine.saved) == ["user0", "user1"]
+    assert engine._dirty_profiles == {}
+    assert (await engine.learning_store.get_profile("user0"))["interactions"] == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried_with_backoff(engine):
+    """Falhas voltam para pendentes e um novo flush é agendado sem nova interação"""
+    save_profile = engine.learning_store.save_profile
+    attempts = []
+
+    async def flaky_save(profile):
+        attempts.append(profile.user_id)
+        if len(attempts) == 1:
+            return False
+        return await save_profile(profile)
+
+    engine.learning_store.save_profile = flaky_save
+    await engine.learn_from_interaction("idle_user", "oi", "olá", {})
+
+    await _wait_for(lambda: engine._flush_failures == 1)
+    assert attempts == ["idle_user"]
+    assert "idle_user" in engine._dirty_profiles
+    assert not engine._flush_task.done()
+
+    await _wait_for(lambda: len(attempts) == 2 and engine._flush_task.done())
+    assert attempts == ["idle_user", "idle_user"]
+    assert engine._dirty_profiles == {}
+    assert engine._flush_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_profiles(engine):
+    """Shutdown persiste o que estiver pendente sem esperar a janela"""
+    engine.flush_interval = 60
+    await engine.learn_from_interaction("user", "oi", "olá", {})
+    assert engine.saved == []
+
+    assert await engine.close() == 1
+    assert engine.saved == ["user"]
+    assert engine._flush_task is None
+
+
+@pytest.mark.asyncio
+async def test_close_does_not_schedule_retry(engine):
+    """Falha no flush final fica registrada, mas não agenda task depois do shutdown"""
+    async def failing_save(profile):
+        return False
+
+    engine.learning_store.save_profile = failing_save
+    engine.flush_interval = 60
+    await engine.learn_from_interaction("user", "oi", "olá", {})
+
+    assert await engine.close() == 0
+    assert "user" in engine._dirty_profiles
+    assert engine._flush_task is None
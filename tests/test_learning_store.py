@@ -0,0 +1,411 @@
+import asyncio
+import importlib.util
+import sys
+from datetime import datetime
+
+import pytest
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosResourceNotFoundError
+
+from learning.storage import learning_store
+from learning.storage.learning_store import LearningStore, close_cosmos_clients
+
+
+class _FakeCosmosClient:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_close_cosmos_clients_closes_and_clears(monkeypatch):
+    """Shutdown fecha os clientes compartilhados e o próximo uso cria um novo"""
+    client = _FakeCosmosClient()
+    monkeypatch.setitem(learning_store._cosmos_clients, ("https://cosmos", "key"), client)
+
+    await close_cosmos_clients()
+
+    assert client.closed
+    assert learning_store._cosmos_clients == {}
+
+
+@pytest.mark.asyncio
+async def test_store_without_cosmos_sdk_uses_memory(monkeypatch, learning_settings):
+    """Sem azure-cosmos o módulo importa e o store cai para memória mesmo com Cosmos configurado"""
+    for name in ("azure.cosmos", "azure.cosmos.exceptions", "azure.core"):
+        monkeypatch.setitem(sys.modules, name, None)
+
+    spec = importlib.util.spec_from_file_location("_learning_store_no_sdk", learning_store.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    learning_settings.cosmos.endpoint = "https://cosmos.example"
+    learning_settings.cosmos.key = "key"
+    store = module.LearningStore(learning_settings)
+
+    assert not module.COSMOS_SDK_AVAILABLE
+    assert await store.save_knowledge({"topic": "t", "content": "c"})
+    assert store.client is None
+    assert len(store.memory_knowledge["general"]) == 1
+
+
+class _FakePatternsContainer:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    async def execute_item_batch(self, batch_operations, partition_key):
+        await asyncio.sleep(self.delay)
+        self.batches.append((partition_key, len(batch_operations)))
+
+
+@pytest.fixture
+def store(learning_settings):
+    return LearningStore(learning_settings)
+
+
+@pytest.mark.asyncio
+async def test_save_pattern_coalesces_into_batches(store):
+    """Padrões da mesma janela viram um batch por usuário"""
+    store.patterns_container = _FakePatternsContainer()
+
+    results = await asyncio.gather(*(
+        store.save_pattern({"userId": f"user{i % 2}", "pattern_type": "t"}) for i in range(6)
+    ))
+
+    assert results == [True] * 6
+    assert sorted(store.patterns_container.batches) == [("user0", 3), ("user1", 3)]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_pattern_flush_releases_waiters(store):
+    """Flush cancelado no meio do batch resolve os futures com False"""
+    store.patterns_container = _FakePatternsContainer(delay=10)
+    waiter = asyncio.create_task(store.save_pattern({"userId": "user", "pattern_type": "t"}))
+
+    await asyncio.sleep(store.pattern_flush_interval * 3)
+    store._pattern_flush_task.cancel()
+
+    assert await asyncio.wait_for(waiter, timeout=1) is False
+
+
+@pytest.mark.asyncio
+async def test_failed_pattern_flush_releases_waiters(store, monkeypatch):
+    """Erro antes de distribuir os resultados também libera quem está esperando"""
+    store.patterns_container = _FakePatternsContainer()
+
+    async def broken_batch(user_id, patterns):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(store, "_execute_pattern_batch", broken_batch)
+
+    assert await asyncio.wait_for(
+        store.save_pattern({"userId": "user", "pattern_type": "t"}), timeout=1
+    ) is False
+
+
+@pytest.mark.asyncio
+async def test_close_drains_pending_patterns(store):
+    """Shutdown grava o que está na fila sem esperar a janela"""
+    store.patterns_container = _FakePatternsContainer()
+    store.pattern_flush_interval = 60
+    waiter = asyncio.create_task(store.save_pattern({"userId": "user", "pattern_type": "t"}))
+    await asyncio.sleep(0)
+
+    assert await store.close() == 1
+    assert await waiter is True
+    assert store.patterns_container.batches == [("user", 1)]
+
+
+class _FakeProfilesContainer:
+    def __init__(self):
+        self.items = {}
+        self.reads = 0
+
+    async def upsert_item(self, body):
+        self.items[body["id"]] = dict(body)
+
+    async def read_item(self, item, partition_key):
+        self.reads += 1
+        await asyncio.sleep(0.01)
+        return dict(self.items[item])
+
+
+class _Profile:
+    def __init__(self, user_id, data):
+        self.user_id = user_id
+        self.data = data
+
+    def to_dict(self):
+        return {"user_id": self.user_id, **self.data}
+
+
+@pytest.mark.asyncio
+async def test_cached_profile_is_returned_as_copy(store):
+    """Mutar o perfil retornado não altera o cache nem outros leitores"""
+    store.profiles_container = _FakeProfilesContainer()
+    await store.save_profile(_Profile("user", {"topics": ["a"], "stats": {"n": 1}}))
+
+    first = await store.get_profile("user")
+    first["topics"].append("b")
+    first["stats"]["n"] = 99
+
+    second = await store.get_profile("user")
+    assert second["topics"] == ["a"]
+    assert second["stats"] == {"n": 1}
+    assert store.profiles_container.reads == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_search_is_returned_as_copy(store, monkeypatch):
+    """Mutar resultados de busca em cache não altera o cache nem outros leitores"""
+    queries = 0
+
+    async def stream(query, domain):
+        nonlocal queries
+        queries += 1
+        yield {"id": "k1", "topic": "caixa", "tags": ["a"]}
+
+    store.knowledge_container = object()
+    monkeypatch.setattr(store, "_stream_knowledge", stream)
+
+    first = await store.search_knowledge("caixa")
+    first[0]["tags"].append("b")
+    first.pop()
+
+    second = await store.search_knowledge("caixa")
+    assert second == [{"id": "k1", "topic": "caixa", "tags": ["a"]}]
+    assert queries == 1
+
+
+@pytest.mark.asyncio
+async def test_timestamps_keep_microseconds(store, monkeypatch):
+    """Timestamps persistidos mantêm a resolução de datetime.isoformat()"""
+    class _FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2026, 1, 1, 12, 0, 0, 123456)
+
+    monkeypatch.setattr(learning_store, "datetime", _FixedDatetime)
+    item = {"topic": "a", "content": "x"}
+    await store.save_knowledge(item)
+
+    assert item["created_at"] == "2026-01-01T12:00:00.123456"
+
+
+def _precondition_failed():
+    return CosmosAccessConditionFailedError(status_code=412, message="Precondition Failed")
+
+
+class _FakeKnowledgeContainer:
+    """Container em memória com a semântica de patch/ETag usada pelo LearningStore"""
+
+    def __init__(self, *items):
+        self.items = {item["id"]: dict(item, _etag="0") for item in items}
+        self.patches = []
+        self.replaces = 0
+        self.concurrent_writes = 0  # Próximos replace_item perdem a corrida para outro writer
+
+    def _get(self, item_id, domain):
+        doc = self.items.get(item_id)
+        if doc is None or doc["domain"] != domain:
+            raise CosmosResourceNotFoundError(status_code=404, message="Not Found")
+        return doc
+
+    def _bump(self, doc):
+        doc["_etag"] = str(int(doc["_etag"]) + 1)
+
+    async def patch_item(self, item, partition_key, patch_operations, filter_predicate):
+        self.patches.append((patch_operations, filter_predicate))
+        doc = self._get(item, partition_key)
+        incr = next(op for op in patch_operations if op["op"] == "incr")
+        if "confidence" not in doc or not 0 <= doc["confidence"] + incr["value"] <= 1:
+            raise _precondition_failed()
+        doc["confidence"] += incr["value"]
+        for op in patch_operations:
+            if op["op"] == "set":
+                doc[op["path"].lstrip("/")] = op["value"]
+        self._bump(doc)
+        return dict(doc)
+
+    async def read_item(self, item, partition_key):
+        return dict(self._get(item, partition_key))
+
+    async def replace_item(self, item, body, etag, match_condition):
+        doc = self._get(item, body["domain"])
+        if self.concurrent_writes:
+            self.concurrent_writes -= 1
+            self._bump(doc)
+        if etag != doc["_etag"]:
+            raise _precondition_failed()
+        self.replaces += 1
+        doc.clear()
+        doc.update(body)
+        self._bump(doc)
+        return dict(doc)
+
+    async def query_items(self, query, parameters, max_item_count=None):
+        wanted = parameters[0]["value"]
+        for doc in self.items.values():
+            if doc["id"] == wanted:
+                yield dict(doc)
+
+
+@pytest.fixture
+def knowledge_store(store):
+    store.knowledge_container = _FakeKnowledgeContainer(
+        {"id": "k1", "domain": "finance", "confidence": 0.5},
+        {"id": "k2", "domain": "finance", "confidence": 0.9},
+        {"id": "k3", "domain": "finance"},
+    )
+    return store
+
+
+@pytest.mark.asyncio
+async def test_confidence_patch_in_range(knowledge_store):
+    """Dentro de [0, 1] basta o patch: incr na confidence e set no last_updated"""
+    container = knowledge_store.knowledge_container
+
+    assert await knowledge_store.update_knowledge_confidence("k1", 0.2, domain="finance")
+
+    assert container.items["k1"]["confidence"] == pytest.approx(0.7)
+    assert "last_updated" in container.items["k1"]
+    assert container.replaces == 0
+    operations, predicate = container.patches[0]
+    assert operations[0] == {"op": "incr", "path": "/confidence", "value": 0.2}
+    assert operations[1]["op"] == "set" and operations[1]["path"] == "/last_updated"
+    assert predicate == (
+        "FROM c WHERE c.confidence + 0.2000000000 >= 0 AND c.confidence + 0.2000000000 <= 1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_confidence_patch_out_of_range_falls_back_to_clamped_replace(knowledge_store):
+    """Filtro rejeita o patch fora de [0, 1]: read + replace com clamp"""
+    container = knowledge_store.knowledge_container
+
+    assert await knowledge_store.update_knowledge_confidence("k2", 0.3, domain="finance")
+
+    assert container.items["k2"]["confidence"] == 1.0
+    assert container.replaces == 1
+
+
+@pytest.mark.asyncio
+async def test_confidence_patch_without_field_uses_default(knowledge_store):
+    """Item sem confidence parte do padrão 0.5 no replace"""
+    assert await knowledge_store.update_knowledge_confidence("k3", -0.1, domain="finance")
+
+    assert knowledge_store.knowledge_container.items["k3"]["confidence"] == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_confidence_replace_retries_on_etag_conflict(knowledge_store):
+    """ETag desatualizado: relê e tenta de novo, até _CONFIDENCE_RETRIES vezes"""
+    container = knowledge_store.knowledge_container
+    container.concurrent_writes = learning_store._CONFIDENCE_RETRIES - 1
+
+    assert await knowledge_store.update_knowledge_confidence("k2", 0.3, domain="finance")
+    assert container.items["k2"]["confidence"] == 1.0
+
+    container.items["k2"]["confidence"] = 0.9
+    container.concurrent_writes = learning_store._CONFIDENCE_RETRIES
+    assert not await knowledge_store.update_knowledge_confidence("k2", 0.3, domain="finance")
+    assert container.items["k2"]["confidence"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_confidence_update_missing_item(knowledge_store):
+    assert not await knowledge_store.update_knowledge_confidence("missing", 0.1, domain="finance")
+    assert not await knowledge_store.update_knowledge_confidence("missing", 0.1)
+
+
+@pytest.mark.asyncio
+async def test_confidence_update_without_domain_uses_query_and_replace(knowledge_store):
+    """Sem domain o item é localizado por query e atualizado com replace condicionado"""
+    container = knowledge_store.knowledge_container
+
+    assert await knowledge_store.update_knowledge_confidence("k1", -0.2)
+
+    assert container.items["k1"]["confidence"] == pytest.approx(0.3)
+    assert container.patches == []
+    assert container.replaces == 1
+
+
+def test_pack_profile_round_trip():
+    """Perfis grandes vão comprimidos e voltam idênticos; pequenos passam intactos"""
+    doc = {
+        "id": "profile_u", "userId": "u", "user_id": "u", "type": "user_profile", "last_saved": "now",
+        "topics": ["finanças"] * 200, "stats": {"n": 3},
+    }
+
+    packed = learning_store._pack_profile(dict(doc), threshold=64)
+    assert "payload_zlib" in packed and "topics" not in packed
+    assert packed["id"] == "profile_u" and packed["userId"] == "u"
+    assert learning_store._unpack_profile(packed) == doc
+
+    small = {"id": "profile_s", "userId": "s", "stats": {"n": 1}}
+    assert learning_store._pack_profile(small, threshold=4096) is small
+    assert learning_store._unpack_profile(dict(small)) == small
+
+
+def test_trigram_index_search():
+    """Candidatos por trigramas, confirmação por substring, ordem de inserção"""
+    index = learning_store._TrigramIndex()
+    docs = [
+        {"content_lc": "fluxo de caixa mensal", "topic_lc": "financeiro"},
+        {"content_lc": "relatório de vendas", "topic_lc": "comercial"},
+        {"content_lc": "caixa postal", "topic_lc": "correio"},
+    ]
+    for doc in docs:
+        index.add(doc)
+
+    assert index.search("caixa") == [docs[0], docs[2]]
+    assert index.search("financ") == [docs[0]]
+    assert index.search("de") == [docs[0], docs[1]]  # Curta demais: varre tudo
+    assert index.search("xyz") == []
+    assert index.search("aixa m") == [docs[0]]
+
+    index.remove_oldest()
+    assert index.search("caixa") == [docs[2]]
+    assert "flu" not in index.grams
+
+
+@pytest.mark.asyncio
+async def test_cached_read_dedups_in_flight_loads(store):
+    """Leituras concorrentes da mesma chave compartilham uma chamada e o resultado vai para o cache"""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 1}
+
+    cache, inflight = learning_store.TTLCache(maxsize=10, ttl=60), {}
+    results = await asyncio.gather(*(
+        store._cached_read(cache, inflight, "key", loader) for _ in range(5)
+    ))
+
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5
+    assert cache.get("key") == {"value": 1}
+    assert inflight == {}
+
+    assert await store._cached_read(cache, inflight, "key", loader) == {"value": 1}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_read_skips_cache_when_invalidated_mid_flight(store):
+    """Escrita durante a leitura descarta a leitura em voo: o resultado antigo não entra no cache"""
+    async def loader():
+        await asyncio.sleep(0.01)
+        return {"value": "old"}
+
+    cache, inflight = learning_store.TTLCache(maxsize=10, ttl=60), {}
+    reader = asyncio.create_task(store._cached_read(cache, inflight, "key", loader))
+    await asyncio.sleep(0)
+    inflight.pop("key")
+
+    assert await reader == {"value": "old"}
+    assert cache.get("key") is None
@@ -0,0 +1,62 @@
+import pytest
+from config.settings import Settings
+from skills import skill_registry
+from skills.skill_registry import SkillRegistry
+
+@pytest.fixture
+def registry():
+    settings = Settings.from_yaml("bot_config.yaml")
+    settings.skills = {
+        "registry": [
+            {"name": "api_caller", "enabled": True, "config": {"timeout": 5}},
+            {"name": "report_generator", "enabled": False},
+            {"name": "broken_skill", "enabled": True},
+        ]
+    }
+    registry = SkillRegistry(settings)
+    registry.load_index()
+    return registry
+
+def test_load_index_does_not_instantiate(registry):
+    """load_index só indexa os skills habilitados"""
+    assert registry.skills == {}
+    assert sorted(registry.list_skills()) == ["api_caller", "broken_skill"]
+
+def test_get_skill_instantiates_on_first_use(registry):
+    """get_skill cria a instância uma vez e tira o skill do índice"""
+    skill = registry.get_skill("api_caller")
+
+    assert skill is not None
+    assert skill.timeout == 5
+    assert registry.get_skill("api_caller") is skill
+    assert "api_caller" not in registry._index
+    assert registry.get_skill("report_generator") is None
+
+def test_failed_skill_is_not_retried(registry, monkeypatch):
+    """Skill que falhou sai do índice, não é reimportado e não aparece como disponível"""
+    calls = []
+    load_custom = registry._load_custom_skill
+
+    def counting_load(skill_name, config):
+        calls.append(skill_name)
+        return load_custom(skill_name, config)
+
+    monkeypatch.setattr(registry, "_load_custom_skill", counting_load)
+
+    assert registry.get_skill("broken_skill") is None
+    assert registry.get_skill("broken_skill") is None
+    assert calls == ["broken_skill"]
+    assert "broken_skill" in registry.failed_skills
+    assert "broken_skill" not in registry.list_skills()
+
+@pytest.mark.asyncio
+async def test_find_appropriate_skill_materializes_index(registry, monkeypatch):
+    """find_appropriate_skill instancia o índice uma vez e ignora quem falhou"""
+    monkeypatch.setitem(skill_registry.BUILTIN_SKILLS, "broken_skill", ("skills.missing_module", "Missing"))
+
+    skill = await registry.find_appropriate_skill("api_call", {})
+    assert skill is registry.skills["api_caller"]
+    assert registry._index == {}
+    assert "broken_skill" in registry.failed_skills
+
+    assert await registry.find_appropriate_skill("unknown_intent", {}) is None
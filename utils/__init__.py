@@ -1,11 +1,13 @@
 """
 Utility functions and helpers.
-Includes logger, metrics, and helper functions.
+Includes logger, metrics, cache, and helper functions.
 """
 
 from .logger import get_logger, setup_logging
 from .metrics import record_metrics, metrics_router
 from .helpers import generate_id, normalize_text, extract_entities, validate_email, get_current_timestamp, safe_get
+from .cache import TTLCache
+from .health_middleware import HealthCheckMiddleware
 
 __all__ = [
     'get_logger',
@@ -17,5 +19,7 @@ __all__ = [
     'extract_entities',
     'validate_email',
     'get_current_timestamp',
-    'safe_get'
+    'safe_get',
+    'TTLCache',
+    'HealthCheckMiddleware'
 ]
\ No newline at end of file
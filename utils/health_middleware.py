@@ -0,0 +1,38 @@
+"""
+Middleware ASGI puro para probes de health
+Responde os paths configurados antes do resto da stack (CORS, roteamento, dependências)
+"""
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+# Handler recebe a aplicação Starlette (scope["app"]) e devolve (status, content-type, corpo)
+HealthHandler = Callable[[Any], Tuple[int, bytes, bytes]]
+
+ASGIApp = Callable[[Dict[str, Any], Callable[[], Awaitable[Dict[str, Any]]], Callable[[Dict[str, Any]], Awaitable[None]]], Awaitable[None]]
+
+
+class HealthCheckMiddleware:
+    """
+    Atende GET nos paths de health sem passar pelos middlewares internos nem pelo router
+    Outros métodos nesses paths recebem 405 (mesmo comportamento das rotas FastAPI)
+    """
+
+    def __init__(self, app: ASGIApp, handlers: Dict[str, HealthHandler]):
+        self.app = app
+        self.handlers = handlers
+
+    async def __call__(self, scope, receive, send) -> None:
+        handler = self.handlers.get(scope["path"]) if scope["type"] == "http" else None
+        if handler is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "GET":
+            status, content_type, body = handler(scope["app"])
+            headers = [(b"content-type", content_type)]
+        else:
+            status, body = 405, b'{"detail":"Method Not Allowed"}'
+            headers = [(b"content-type", b"application/json"), (b"allow", b"GET")]
+
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
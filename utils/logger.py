@@ -1,22 +1,61 @@
+import atexit
 import logging
+import queue
 import sys
 import os
 import structlog
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+# Listener que escreve os logs no stdout (thread própria)
+_queue_listener: Optional[QueueListener] = None
+
+def _stop_queue_listener() -> None:
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+def _restart_queue_listener_after_fork() -> None:
+    """
+    Threads não sobrevivem ao fork (ex.: gunicorn com preload_app):
+    o processo filho sobe um listener novo sobre a mesma fila
+    Registros herdados na fila já são escritos pelo listener do pai: descarta para não duplicar
+    """
+    global _queue_listener
+    
+    if _queue_listener is not None:
+        log_queue = _queue_listener.queue
+        while True:
+            try:
+                log_queue.get_nowait()
+            except queue.Empty:
+                break
+        _queue_listener = QueueListener(log_queue, *_queue_listener.handlers)
+        _queue_listener.start()
+
 def setup_logging(level: Optional[str] = None) -> None:
     """
     Configura logging estruturado para a aplicação.
     """
+    global _queue_listener
+    
     # Pega o nível de log do ambiente ou usa INFO como padrão
     log_level = level or os.getenv("LOG_LEVEL", "INFO").upper()
     
     # Configura o logging básico do Python
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format="%(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)]
-    )
+    # Quem loga só enfileira; a escrita no stdout acontece na thread do QueueListener,
+    # fora do event loop
+    if _queue_listener is None:
+        log_queue = queue.SimpleQueue()
+        _queue_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+        _queue_listener.start()
+        atexit.register(_stop_queue_listener)
+        os.register_at_fork(after_in_child=_restart_queue_listener_after_fork)
+        
+        logging.basicConfig(
+            level=getattr(logging, log_level),
+            format="%(message)s",
+            handlers=[QueueHandler(log_queue)]
+        )
     
     # Determina o formato baseado no ambiente
     is_production = os.getenv("BOT_ENV", "development").lower() == "production"